@@ -0,0 +1,135 @@
+# benchmarks/fakes.py
+# 디스코드 게이트웨이 없이 cog 핸들러를 돌리기 위한 가벼운 대역 객체들
+import itertools
+import random
+from typing import Dict, List, Optional
+
+from member_cache import MemberResolver
+from schedule_index import ScheduleIndex
+from job_scheduler import JobScheduler
+
+_ids = itertools.count(10**17)
+
+
+def _next_id() -> int:
+    return next(_ids)
+
+
+class FakeUser:
+    def __init__(self, name: str, bot: bool = False):
+        self.id = _next_id()
+        self.name = name
+        self.global_name: Optional[str] = None
+        self.bot = bot
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+class FakeMember(FakeUser):
+    def __init__(self, guild: "FakeGuild", name: str, nick: Optional[str] = None, bot: bool = False):
+        super().__init__(name, bot=bot)
+        self.guild = guild
+        self.nick = nick
+        self.voice: Optional["FakeVoiceState"] = None
+
+    @property
+    def display_name(self) -> str:
+        return self.nick or self.global_name or self.name
+
+    def __repr__(self) -> str:
+        return f"<FakeMember {self.display_name}>"
+
+
+class FakeVoiceState:
+    def __init__(self, channel: Optional["FakeVoiceChannel"] = None):
+        self.channel = channel
+
+
+class FakeTextChannel:
+    """send() 호출을 세기만 하는 텍스트 채널."""
+
+    def __init__(self, name: str = "report"):
+        self.id = _next_id()
+        self.name = name
+        self.sent_messages = 0
+        self.sent_chars = 0
+
+    async def send(self, content: str = "", **kwargs):
+        self.sent_messages += 1
+        self.sent_chars += len(content or "")
+
+
+class FakeVoiceChannel:
+    def __init__(self, guild: "FakeGuild", name: str = "study", channel_id: Optional[int] = None):
+        self.id = channel_id or _next_id()
+        self.name = name
+        self.guild = guild
+        self.members: List[FakeMember] = []
+
+
+class FakeGuild:
+    def __init__(self, member_count: int, bot_ratio: float = 0.01, seed: int = 0):
+        self.id = _next_id()
+        self.name = f"guild-{member_count}"
+        rng = random.Random(seed)
+        self.members: List[FakeMember] = []
+        for i in range(member_count):
+            is_bot = rng.random() < bot_ratio
+            nick = f"닉{i}" if rng.random() < 0.5 else None
+            self.members.append(FakeMember(self, f"user{i}", nick=nick, bot=is_bot))
+        self._by_id: Dict[int, FakeMember] = {m.id: m for m in self.members}
+        self.chunked = True
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._by_id.get(user_id)
+
+
+class FakeMessage:
+    def __init__(self, author: FakeMember, content: str, channel: FakeTextChannel):
+        self.author = author
+        self.content = content
+        self.channel = channel
+        self.guild = author.guild
+
+
+class FakeContext:
+    def __init__(self, author: FakeMember, channel: FakeTextChannel):
+        self.author = author
+        self.guild = author.guild
+        self.channel = channel
+
+    async def send(self, content: str = "", **kwargs):
+        await self.channel.send(content, **kwargs)
+
+
+class FakeBot:
+    """cog 들이 실제로 쓰는 속성/메서드만 흉내 냅니다."""
+
+    def __init__(self, guilds: List[FakeGuild]):
+        self.guilds = guilds
+        # 벤치마크에서는 start() 하지 않으므로 작업이 실제로 실행되거나 파일에 쓰이지 않습니다.
+        self.scheduler = JobScheduler()
+        self.schedule_index = ScheduleIndex()
+        self.member_resolver = MemberResolver(lazy=False)
+        self._channels: Dict[int, FakeTextChannel] = {}
+
+    def get_command(self, name: str):
+        return None
+
+    def is_ready(self) -> bool:
+        return True
+
+    def add_channel(self, channel_id: int, channel: FakeTextChannel):
+        self._channels[channel_id] = channel
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+    async def fetch_channel(self, channel_id: int):
+        ch = self._channels.get(channel_id)
+        if ch is None:
+            ch = FakeTextChannel(f"channel-{channel_id}")
+            self._channels[channel_id] = ch
+        return ch
@@ -0,0 +1,397 @@
+# benchmarks/run_bench.py
+# 가짜 길드를 만들어 cog 핸들러에 이벤트를 흘려보내고 지연시간/할당/디스크 쓰기량을 측정합니다.
+#
+# 사용 예:
+#   python -m benchmarks.run_bench --sizes 1000,10000 --events 2000 --out bench.json
+#   python -m benchmarks.run_bench --compare bench.json   # 이전 결과와 비교 (회귀 시 exit 1)
+import argparse
+import asyncio
+import datetime as dt
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# config.py 는 import 시점에 필수 환경변수를 검사하므로 먼저 채워 둡니다.
+os.environ.setdefault("DISCORD_TOKEN", "bench")
+os.environ.setdefault("VOICE_CHANNEL_ID", "1")
+os.environ.setdefault("REPORT_CHANNEL_ID_ENTER", "2")
+os.environ.setdefault("REPORT_CHANNEL_ID_TOEIC", "3")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeBot,
+    FakeContext,
+    FakeGuild,
+    FakeMessage,
+    FakeTextChannel,
+    FakeVoiceChannel,
+    FakeVoiceState,
+)
+from state_store import default_log_file  # noqa: E402
+
+VOICE_CHANNEL_ID = 1
+REPORT_CHANNEL_ID_ENTER = 2
+REPORT_CHANNEL_ID_ALARM = 4
+
+# --voice-grace 로 VOICE_GRACE_SECONDS 를 덮어쓸 때 사용.
+# 기본 0: grace 가 있으면 최대 속도 재생에서 모든 이벤트가 normalizer 에 쌓이기만 하고 입장/퇴장이 서로 상쇄되어,
+# 세션 처리(_commit_enter/_commit_leave)가 측정되지 않습니다.
+VOICE_GRACE_OVERRIDE: Optional[float] = 0.0
+
+# 비교 시 회귀로 판단할 지표들 (값이 클수록 나쁨)
+COMPARE_KEYS = ("p50_ms", "p99_ms", "alloc_peak_kib", "disk_bytes")
+
+
+# ===== 측정 도구 =====
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    # nearest-rank: 오름차순에서 ceil(p/100 * n) 번째 값
+    idx = max(0, min(len(sorted_vals) - 1, math.ceil(pct / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[idx]
+
+
+class DiskWatcher:
+    """통째로 다시 쓰이는 파일은 변경이 감지될 때마다 파일 크기를,
+    append 전용 파일(append_paths)은 늘어난 크기만큼을 쓰기량으로 셉니다."""
+
+    def __init__(self, paths: List[Path], append_paths: Optional[List[Path]] = None):
+        self.append_paths = set(append_paths or [])
+        self.paths = list(paths) + list(self.append_paths)
+        self.bytes_written = 0
+        self.writes = 0
+        self._last = {p: self._stat(p) for p in self.paths}
+
+    @staticmethod
+    def _stat(p: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = p.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def poll(self):
+        for p in self.paths:
+            cur = self._stat(p)
+            if cur is not None and cur != self._last[p]:
+                if p in self.append_paths:
+                    prev = self._last[p]
+                    self.bytes_written += cur[1] - (prev[1] if prev else 0)
+                else:
+                    self.bytes_written += cur[1]
+                self.writes += 1
+            self._last[p] = cur
+
+
+async def _replay(
+    events: List[Any],
+    handler: Callable[[Any], Any],
+    rate: float,
+    watcher: Optional[DiskWatcher] = None,
+) -> List[float]:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for i, ev in enumerate(events):
+        if rate > 0:
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        t0 = time.perf_counter()
+        await handler(ev)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        if watcher:
+            watcher.poll()
+    return latencies
+
+
+async def _measure_alloc(events: List[Any], handler: Callable[[Any], Any]) -> Dict[str, float]:
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for ev in events:
+            await handler(ev)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kib": round((peak - base) / 1024.0, 2),
+        "alloc_net_kib": round((current - base) / 1024.0, 2),
+    }
+
+
+def _summarize(latencies: List[float]) -> Dict[str, float]:
+    s = sorted(latencies)
+    return {
+        "events": len(s),
+        "p50_ms": round(_percentile(s, 50), 4),
+        "p99_ms": round(_percentile(s, 99), 4),
+        "max_ms": round(s[-1], 4) if s else 0.0,
+        "mean_ms": round(sum(s) / len(s), 4) if s else 0.0,
+    }
+
+
+# ===== 시나리오 =====
+
+def _make_world(size: int, seed: int):
+    guild = FakeGuild(size, seed=seed)
+    bot = FakeBot([guild])
+    voice_ch = FakeVoiceChannel(guild, channel_id=VOICE_CHANNEL_ID)
+    report_ch = FakeTextChannel("report")
+    bot.add_channel(REPORT_CHANNEL_ID_ENTER, report_ch)
+    bot.add_channel(REPORT_CHANNEL_ID_ALARM, report_ch)
+    return guild, bot, voice_ch, report_ch
+
+
+def _voice_events(guild: FakeGuild, voice_ch: FakeVoiceChannel, count: int, seed: int):
+    """입장/퇴장 이벤트 열. 활동하는 인원은 길드 규모와 무관하게 소수로 제한합니다."""
+    rng = random.Random(seed)
+    humans = [m for m in guild.members if not m.bot]
+    active = rng.sample(humans, min(len(humans), 50))
+    inside = set()
+    events = []
+    for _ in range(count):
+        m = rng.choice(active)
+        if m.id in inside:
+            inside.discard(m.id)
+            events.append((m, voice_ch, None))
+        else:
+            inside.add(m.id)
+            events.append((m, None, voice_ch))
+    return events
+
+
+def _apply_voice(member, before_ch, after_ch):
+    if before_ch is not None and member in before_ch.members:
+        before_ch.members.remove(member)
+    if after_ch is not None:
+        after_ch.members.append(member)
+    member.voice = FakeVoiceState(after_ch) if after_ch else None
+    return FakeVoiceState(before_ch), FakeVoiceState(after_ch)
+
+
+def _patch_voice_module(data_file: Path, grace: Optional[float]):
+    import cogs.voice_time as voice_time
+
+    if grace is not None:
+        voice_time.VOICE_GRACE_SECONDS = grace
+    voice_time.DATA_FILE = str(data_file)
+    voice_time.SESSION_LOG_FILE = default_log_file(str(data_file))
+    voice_time.VOICE_CHANNEL_ID = VOICE_CHANNEL_ID
+    voice_time.REPORT_CHANNEL_ID_ENTER = REPORT_CHANNEL_ID_ENTER
+    voice_time.REPORT_CHANNEL_ID_ALARM = REPORT_CHANNEL_ID_ALARM
+    return voice_time
+
+
+async def bench_voice(size: int, events: int, rate: float, alloc_events: int, seed: int, tmp: Path):
+    result: Dict[str, Any] = {"scenario": "voice", "members": size}
+
+    async def run(n: int, measure_alloc: bool):
+        guild, bot, voice_ch, report_ch = _make_world(size, seed)
+        data_file = tmp / f"voice_{size}_{int(measure_alloc)}.json"
+        voice_time = _patch_voice_module(data_file, VOICE_GRACE_OVERRIDE)
+        cog = voice_time.VoiceTimeCog(bot)
+        evs = _voice_events(guild, voice_ch, n, seed)
+
+        async def handler(ev):
+            member, before_ch, after_ch = ev
+            before, after = _apply_voice(member, before_ch, after_ch)
+            await cog.on_voice_state_update(member, before, after)
+
+        try:
+            if measure_alloc:
+                return await _measure_alloc(evs, handler), None, report_ch
+            watcher = DiskWatcher([data_file], append_paths=[Path(cog.store.log_file)])
+            latencies = await _replay(evs, handler, rate, watcher)
+            # grace 대기 중인 전환까지 확정시켜 디스크 쓰기량에 포함
+            await cog.normalizer.flush()
+            watcher.poll()
+            return latencies, watcher, report_ch
+        finally:
+            await cog.cog_unload()
+
+    latencies, watcher, report_ch = await run(events, False)
+    result.update(_summarize(latencies))
+    result["disk_bytes"] = watcher.bytes_written
+    result["disk_writes"] = watcher.writes
+    result["messages_sent"] = report_ch.sent_messages
+    alloc, _, _ = await run(alloc_events, True)
+    result.update(alloc)
+    return result
+
+
+def _name_queries(guild: FakeGuild, count: int, seed: int) -> List[str]:
+    """정확히 일치 / 부분 일치 / 없는 이름을 섞은 `!이름` 메시지 열."""
+    rng = random.Random(seed)
+    humans = [m for m in guild.members if not m.bot]
+    out = []
+    for _ in range(count):
+        r = rng.random()
+        m = rng.choice(humans)
+        if r < 0.6:
+            out.append(f"!{m.display_name}")
+        elif r < 0.9:
+            out.append(f"!{m.display_name[:3]}")
+        else:
+            out.append(f"!없는사람{rng.randint(0, 10**6)}")
+    return out
+
+
+async def bench_mention(size: int, events: int, rate: float, alloc_events: int, seed: int, tmp: Path):
+    import cogs.mention_shortcut as mention_shortcut
+
+    mention_shortcut.MENTION_CHANNEL_ID = 0
+    guild, bot, _, _ = _make_world(size, seed)
+    cog = mention_shortcut.MentionShortcutCog(bot)
+    author = next(m for m in guild.members if not m.bot)
+    channel = FakeTextChannel("general")
+
+    async def handler(content):
+        await cog.on_message(FakeMessage(author, content, channel))
+
+    result: Dict[str, Any] = {"scenario": "mention", "members": size}
+    result.update(_summarize(await _replay(_name_queries(guild, events, seed), handler, rate)))
+    result["disk_bytes"] = 0
+    result["disk_writes"] = 0
+    result["messages_sent"] = channel.sent_messages
+    result.update(await _measure_alloc(_name_queries(guild, alloc_events, seed + 1), handler))
+    return result
+
+
+async def bench_menu(size: int, events: int, rate: float, alloc_events: int, seed: int, tmp: Path):
+    import cogs.menu_commands as menu_commands
+    from menu_recommender import MenuRecommender
+
+    guild, bot, _, _ = _make_world(size, seed)
+    history_file = tmp / f"menu_history_{size}.json"
+    cog = menu_commands.MenuCog.__new__(menu_commands.MenuCog)
+    cog.bot = bot
+    cog.recommender = MenuRecommender(history_path=history_file)
+    rng = random.Random(seed)
+    humans = [m for m in guild.members if not m.bot]
+    channel = FakeTextChannel("general")
+
+    def make_events(n):
+        return [FakeContext(rng.choice(humans), channel) for _ in range(n)]
+
+    async def handler(ctx):
+        await menu_commands.MenuCog.menu_prefix.callback(cog, ctx)
+
+    watcher = DiskWatcher([history_file])
+    result: Dict[str, Any] = {"scenario": "menu", "members": size}
+    result.update(_summarize(await _replay(make_events(events), handler, rate, watcher)))
+    result["disk_bytes"] = watcher.bytes_written
+    result["disk_writes"] = watcher.writes
+    result["messages_sent"] = channel.sent_messages
+    result.update(await _measure_alloc(make_events(alloc_events), handler))
+    return result
+
+
+SCENARIOS = {
+    "voice": bench_voice,
+    "mention": bench_mention,
+    "menu": bench_menu,
+}
+
+
+# ===== 결과 비교 =====
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, encoding="utf-8", stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    base_idx = {(r["scenario"], r["members"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current.get("results", []):
+        b = base_idx.get((r["scenario"], r["members"]))
+        if not b:
+            continue
+        for key in COMPARE_KEYS:
+            old, new = b.get(key, 0), r.get(key, 0)
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append(
+                    f"{r['scenario']}@{r['members']} {key}: {old} -> {new} (+{(new / old - 1) * 100:.1f}%)"
+                )
+    return regressions
+
+
+async def main_async(args) -> Dict[str, Any]:
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        for name in names:
+            for size in sizes:
+                print(f"[BENCH] {name} members={size} ...", file=sys.stderr)
+                # 핸들러 로그는 logging 기본 처리(stderr)로 나가므로 stdout 의 결과 JSON 과 섞이지 않습니다.
+                r = await SCENARIOS[name](size, args.events, args.rate, args.alloc_events, args.seed, tmp)
+                results.append(r)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "events": args.events,
+            "rate": args.rate,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="디스코드 cog 오프라인 벤치마크")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="길드 멤버 수 (쉼표 구분)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="실행할 시나리오 (쉼표 구분)")
+    parser.add_argument("--events", type=int, default=2000, help="시나리오당 이벤트 수")
+    parser.add_argument("--alloc-events", type=int, default=200, help="할당량 측정용 이벤트 수")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 이벤트 수 (0 = 최대 속도)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--voice-grace", type=float, default=0.0,
+                        help="VOICE_GRACE_SECONDS 덮어쓰기 (기본 0 = 이벤트마다 바로 확정, 음수면 설정값 사용)")
+    parser.add_argument("--out", help="결과 JSON 저장 경로 (없으면 stdout)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판단 기준 (0.2 = 20%% 악화)")
+    args = parser.parse_args(argv)
+    global VOICE_GRACE_OVERRIDE
+    VOICE_GRACE_OVERRIDE = args.voice_grace if args.voice_grace >= 0 else None
+
+    report = asyncio.run(main_async(args))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(baseline, report, args.threshold)
+        for line in regressions:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
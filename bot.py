@@ -1,8 +1,19 @@
 # bot.py
+import hashlib
+import json
+import logging
+import subprocess
+import time
+from pathlib import Path
+
 import discord
-import subprocess  # [추가] 깃 명령어 실행용
 from discord.ext import commands
-from config import REPORT_CHANNEL_ID_ALARM
+from config import REPORT_CHANNEL_ID_ALARM, MEMBER_CACHE_MODE, RECENT_MEMBER_CACHE_SIZE, BOT_SHARDED
+from member_cache import MemberResolver
+from schedule_index import ScheduleIndex
+from job_scheduler import JobScheduler
+
+log = logging.getLogger("bot")
 
 intents = discord.Intents.default()
 intents.guilds = True
@@ -10,33 +21,86 @@ intents.voice_states = True
 intents.members = True
 intents.message_content = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
-bot.active_schedules = {}
+lazy_members = MEMBER_CACHE_MODE == "lazy"
+bot_options = {}
+if lazy_members:
+    # 음성 채널에 있는 멤버와 새로 들어온 멤버만 캐시하고, 시작 시 전체 청킹은 하지 않음
+    member_cache_flags = discord.MemberCacheFlags.none()
+    member_cache_flags.voice = True
+    member_cache_flags.joined = True
+    bot_options["member_cache_flags"] = member_cache_flags
+    bot_options["chunk_guilds_at_startup"] = False
+
+bot_cls = commands.AutoShardedBot if BOT_SHARDED else commands.Bot
+bot = bot_cls(command_prefix="!", intents=intents, **bot_options)
+bot.schedule_index = ScheduleIndex()
+bot.member_resolver = MemberResolver(lazy=lazy_members, recent_size=RECENT_MEMBER_CACHE_SIZE)
+
+BUILD_INFO_FILE = Path(__file__).resolve().parent / "build_info.txt"
+COMMAND_HASH_FILE = Path(__file__).resolve().parent / "data" / "command_sync_hash.txt"
+JOBS_FILE = Path(__file__).resolve().parent / "data" / "jobs.json"
 
-# [추가] 최신 커밋 정보를 가져오는 함수
+# 주간 리포트 같은 주기 작업 (cog 가 cog_load 에서 등록)
+bot.scheduler = JobScheduler(str(JOBS_FILE))
+
+# 확장 이름 -> 실행 중인 cog 코드의 파일 해시 (!reload 가 새 코드가 있는지 판단. admin cog 를 다시 불러와도 유지)
+bot.loaded_code_digests = {}
+
+# 프로세스당 한 번만 배포 알림을 보내기 위한 플래그 (게이트웨이 재연결 시 on_ready 가 다시 불림)
+_deploy_announced = False
+
+# 최신 커밋 정보를 가져오는 함수
+# 배포 시 redeploy.sh 가 이미지 빌드 전에 build_info.txt (해시/작성자/메시지 3줄)를 만들어 둡니다.
+# 파일이 없을 때(로컬 실행)만 git 을 한 번 호출합니다.
 def get_git_commit_info():
     try:
-        # 최신 커밋 메시지 가져오기
-        msg = subprocess.check_output(['git', 'log', '-1', '--pretty=%s'], encoding='utf-8').strip()
-        # 최신 커밋 해시(짧게) 가져오기
-        sha = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], encoding='utf-8').strip()
-        # 작성자 가져오기
-        author = subprocess.check_output(['git', 'log', '-1', '--pretty=%an'], encoding='utf-8').strip()
-        
+        if BUILD_INFO_FILE.exists():
+            lines = BUILD_INFO_FILE.read_text(encoding="utf-8").splitlines()
+        else:
+            out = subprocess.check_output(
+                ['git', 'log', '-1', '--pretty=%h%n%an%n%s'], encoding='utf-8'
+            )
+            lines = out.splitlines()
+        sha, author, msg = (lines + ["", "", ""])[:3]
+        if not sha:
+            raise ValueError("빈 커밋 정보")
         return f"{msg} (`{sha}` by {author})"
     except Exception as e:
-        print(f"[WARNING] 커밋 정보 가져오기 실패: {e}")
+        log.warning("커밋 정보 가져오기 실패: %s", e)
         return "커밋 정보를 불러올 수 없습니다."
 
-@bot.event
-async def on_ready():
-    print(f"Logged in as {bot.user} (id={bot.user.id})")
+def _command_tree_hash() -> str:
+    payload = [cmd.to_dict(bot.tree) for cmd in bot.tree.get_commands()]
+    payload.sort(key=lambda c: (c.get("type", 1), c.get("name", "")))
+    raw = json.dumps({"app": bot.application_id, "commands": payload}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
+# 슬래시 명령 동기화: 로그인 직후 프로세스당 한 번, 명령 트리가 바뀌었을 때만 실행합니다.
+async def _setup_hook():
+    bot.scheduler.start()
     try:
+        current = _command_tree_hash()
+        previous = COMMAND_HASH_FILE.read_text(encoding="utf-8").strip() if COMMAND_HASH_FILE.exists() else ""
+        if current == previous:
+            log.debug("slash commands unchanged, sync skipped")
+            return
         synced = await bot.tree.sync()
-        print(f"[DEBUG] slash commands synced: {len(synced)}")
+        log.info("slash commands synced: %d", len(synced))
+        COMMAND_HASH_FILE.parent.mkdir(parents=True, exist_ok=True)
+        COMMAND_HASH_FILE.write_text(current, encoding="utf-8")
     except Exception as e:
-        print(f"[DEBUG] slash sync error: {e}")
+        log.warning("slash sync error: %s", e)
+
+bot.setup_hook = _setup_hook
+
+@bot.event
+async def on_ready():
+    global _deploy_announced
+    log.info("Logged in as %s (id=%s)", bot.user, bot.user.id)
+
+    if _deploy_announced:
+        return
+    _deploy_announced = True
 
     # ---------------------------------------------------------
     # 배포 완료 알림 (커밋 정보 포함)
@@ -62,5 +126,19 @@ async def on_ready():
                 await channel.send(embed=embed)
                 
         except Exception as e:
-            print(f"[ERROR] 배포 알림 전송 실패: {e}")
-            
\ No newline at end of file
+            log.error("배포 알림 전송 실패: %s", e)
+
+# 명령 처리 시간 기록 (cog / guild / latency 필드로 남김)
+@bot.listen()
+async def on_command(ctx: commands.Context):
+    ctx.started_at = time.perf_counter()
+
+@bot.listen()
+async def on_command_completion(ctx: commands.Context):
+    started = getattr(ctx, "started_at", None)
+    log.info("command %s", ctx.command.qualified_name, extra={
+        "event": "command",
+        "cog": ctx.cog.qualified_name if ctx.cog else None,
+        "guild": ctx.guild.id if ctx.guild else None,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2) if started else None,
+    })
@@ -0,0 +1,139 @@
+# cogs/admin.py
+# 관리자 명령: !reload <cog>
+# 컨테이너를 다시 빌드하지 않고 cog 하나만 새 코드로 바꿉니다. 게이트웨이 연결과 멤버 캐시는 그대로 유지됩니다.
+# 1) 저장소(.git)와 git 이 있으면 git pull --ff-only 로 새 코드를 받고
+#    (도커에서는 호스트의 ./cogs 가 마운트되어 있으므로, 호스트에서 git pull 한 뒤 명령을 실행합니다)
+# 2) 파일 내용이 지금 실행 중인 코드와 같으면 아무것도 하지 않고 알려 줍니다.
+# 3) 해당 cog 의 메모리 상태를 export_state() 로 꺼낸 뒤 bot.reload_extension 으로 다시 불러오고
+# 4) 새 cog 에 import_state() 로 되돌려 넣습니다 (무중단 재배포와 같은 훅).
+# cog 모듈(cogs/*.py)만 다시 불러오므로, 최상위 모듈(menu_recommender.py 등) 변경은 재배포가 필요합니다.
+import asyncio
+import hashlib
+import importlib.util
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from discord.ext import commands
+
+from log_setup import get_logger
+
+log = get_logger("admin", cog="admin")
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+GIT_PULL_TIMEOUT_SECONDS = 60
+
+
+class AdminCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._lock = asyncio.Lock()
+
+    async def cog_load(self):
+        # main.py 에서 다른 cog 들을 먼저 불러오므로, 처음 불릴 때 디스크의 내용이 실행 중인 코드입니다.
+        for extension in self.bot.extensions:
+            self.bot.loaded_code_digests.setdefault(extension, self._source_digest(extension))
+        self.bot.loaded_code_digests.setdefault(__name__, self._source_digest(__name__))
+
+    @staticmethod
+    def _source_digest(extension: str) -> Optional[str]:
+        spec = importlib.util.find_spec(extension)
+        if spec is None or not spec.origin:
+            return None
+        try:
+            with open(spec.origin, "rb") as f:
+                return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+
+    async def _git_pull(self) -> Tuple[Optional[bool], str]:
+        """(성공 여부, 마지막 출력 줄). 저장소나 git 이 없으면 None (도커 이미지 등)."""
+        if not (REPO_DIR / ".git").exists():
+            return None, "저장소 없음 (디스크의 코드를 사용)"
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "git", "pull", "--ff-only",
+                cwd=str(REPO_DIR),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+            out, _ = await asyncio.wait_for(proc.communicate(), timeout=GIT_PULL_TIMEOUT_SECONDS)
+        except FileNotFoundError:
+            return None, "git 없음 (디스크의 코드를 사용)"
+        except asyncio.TimeoutError:
+            proc.kill()
+            return False, "git pull 시간 초과"
+        text = out.decode("utf-8", "replace").strip().splitlines()
+        return proc.returncode == 0, (text[-1] if text else "")
+
+    def _cogs_of(self, extension: str) -> Dict[str, commands.Cog]:
+        return {
+            name: cog for name, cog in self.bot.cogs.items()
+            if type(cog).__module__ == extension or type(cog).__module__.startswith(extension + ".")
+        }
+
+    async def _import_states(self, states: Dict[str, Any]):
+        for name, state in states.items():
+            cog = self.bot.get_cog(name)
+            if cog is None or not hasattr(cog, "import_state"):
+                continue
+            try:
+                await cog.import_state(state)
+            except Exception:
+                log.exception("%s 상태 적용 실패", name, extra={"event": "reload"})
+
+    @commands.command(name="reload")
+    @commands.has_permissions(administrator=True)
+    async def reload(self, ctx: commands.Context, name: str):
+        """!reload <cog>  예: !reload voice_time"""
+        extension = name if name.startswith("cogs.") else f"cogs.{name}"
+        if extension not in self.bot.extensions:
+            loaded = ", ".join(sorted(e.removeprefix("cogs.") for e in self.bot.extensions))
+            await ctx.send(f"불러온 적 없는 cog 입니다: `{name}` (가능: {loaded})")
+            return
+
+        async with self._lock:
+            started = time.perf_counter()
+            pulled, pull_msg = await self._git_pull()
+            if pulled is False:
+                await ctx.send(f"❌ git pull 실패, 다시 불러오지 않았습니다: {pull_msg}")
+                return
+
+            digest = self._source_digest(extension)
+            if digest is not None and digest == self.bot.loaded_code_digests.get(extension):
+                await ctx.send(
+                    f"⚠️ `{extension}` 의 새 코드를 가져오지 못했습니다 (실행 중인 코드와 같음). 다시 불러오지 않았습니다.\n"
+                    f"git: {pull_msg or '변경 없음'}"
+                )
+                return
+
+            states: Dict[str, Any] = {}
+            try:
+                for cog_name, cog in self._cogs_of(extension).items():
+                    if hasattr(cog, "export_state"):
+                        states[cog_name] = await cog.export_state()
+            except Exception as e:
+                # 이미 상태를 꺼내(멈춘) cog 들은 그대로 재개
+                await self._import_states(states)
+                log.exception("%s 상태 수집 실패", extension, extra={"event": "reload"})
+                await ctx.send(f"❌ `{extension}` 상태를 꺼내지 못해 다시 불러오지 않았습니다: {e}")
+                return
+
+            try:
+                await self.bot.reload_extension(extension)
+            except Exception as e:
+                # 실패하면 discord.py 가 이전 모듈로 되돌려 cog 를 다시 만들므로, 거기에 상태를 되돌려 넣습니다.
+                await self._import_states(states)
+                log.exception("%s 다시 불러오기 실패", extension, extra={"event": "reload"})
+                await ctx.send(f"❌ `{extension}` 다시 불러오기 실패 (이전 코드로 계속 실행): {e}")
+                return
+
+            await self._import_states(states)
+            self.bot.loaded_code_digests[extension] = digest
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            log.info("%s 다시 불러옴", extension, extra={"event": "reload", "latency_ms": latency_ms})
+            await ctx.send(f"✅ `{extension}` 새 코드로 다시 불러옴 ({latency_ms}ms)\ngit: {pull_msg or '변경 없음'}")
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(AdminCog(bot))
@@ -23,6 +23,9 @@ class MentionShortcutCog(commands.Cog):
         if not message.guild:
             return
 
+        resolver = self.bot.member_resolver
+        resolver.remember(message.author)
+
         # 4. '!' 뒤에 내용이 없으면 무시
         raw = content[1:].strip()
         if not raw:
@@ -30,10 +33,10 @@ class MentionShortcutCog(commands.Cog):
 
         base_cmd = raw.split()[0].lower()
 
-        # [핵심] 이미 존재하는 명령어(menu, voicetime 등)라면
+        # [핵심] 이미 존재하는 명령어(menu, voicetime, export 등)라면
         # 여기서 아무것도 하지 말고 함수를 종료해야 합니다.
         # 그래야 봇이 기본 기능으로 딱 한 번만 실행합니다.
-        if base_cmd in {"menu", "voicetime"}:
+        if self.bot.get_command(base_cmd):
             return
 
         # ---------------------------------------------------------
@@ -59,8 +62,7 @@ class MentionShortcutCog(commands.Cog):
                 or normalize(gname) == target_n
             )
 
-        members = [m for m in message.guild.members if not m.bot]
-        exact_matches = [m for m in members if is_match(m)]
+        exact_matches = await resolver.find_members(message.guild, is_match, query=target)
 
         if MENTION_CHANNEL_ID:
             target_ch = self.bot.get_channel(MENTION_CHANNEL_ID) \
@@ -94,7 +96,7 @@ class MentionShortcutCog(commands.Cog):
                 or target_n in normalize(gname)
             )
 
-        partials = [m for m in members if is_partial(m)]
+        partials = await resolver.find_members(message.guild, is_partial, query=target)
         if len(partials) == 1:
             await target_ch.send(compose_with_extra(partials[0].mention))
         elif len(partials) > 1:
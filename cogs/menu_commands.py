@@ -1,4 +1,6 @@
 # cogs/menu_commands.py
+from typing import Any, Dict
+
 import discord
 from discord.ext import commands
 
@@ -9,6 +11,14 @@ class MenuCog(commands.Cog):
         self.bot = bot
         self.recommender = MenuRecommender()
 
+    # cog 재로드(!reload) / 무중단 재배포 때 메뉴 목록과 추천 기록을 그대로 넘깁니다.
+    async def export_state(self) -> Dict[str, Any]:
+        return {"menus": self.recommender.menus, "history": self.recommender.history}
+
+    async def import_state(self, state: Dict[str, Any]):
+        self.recommender.menus = state.get("menus", self.recommender.menus)
+        self.recommender.history = state.get("history", self.recommender.history)
+
     # 슬래시 명령
     @discord.app_commands.command(name="menu", description="무작위로 메뉴를 추천합니다.")
     async def menu_slash(self, interaction: discord.Interaction):
@@ -1,379 +1,255 @@
 # cogs/notion_watcher.py
-import asyncio
-import aiohttp
-import json
-import os
+# 노션 변경 이벤트를 받아 디스코드 메시지로 보내는 cog
+# - NOTION_MODE=inprocess: 이 cog 안에서 NotionSyncEngine 을 직접 폴링
+# - NOTION_MODE=ipc: 별도 워커 프로세스(notion_worker.py)가 보내는 이벤트를 로컬 소켓으로 수신
 import datetime as dt
-from typing import Dict, Set, List, Optional, Any
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
+import aiohttp
 from discord.ext import commands, tasks
-from discord.utils import get
 
 from config import (
-    NOTION_TOKEN,
-    NOTION_DATABASE_FEATURE_ID,
-    NOTION_DATABASE_BOARD_ID,
-    NOTION_DATABASE_SCHEDULE_ID,
+    NOTION_MODE,
+    NOTION_IPC_BIND,
+    NOTION_IPC_PORT,
+    NOTION_IPC_TOKEN,
+    NOTION_POLL_MIN_SECONDS,
     REPORT_CHANNEL_ID_FEATURE,
     REPORT_CHANNEL_ID_ALARM,
 )
+from notion_ipc import EventServer, start_event_server
+from notion_diff import CHANGE_CREATED, CHANGE_UPDATED, CHANGE_DELETED, CHANGE_STATUS
+from notion_sync import (
+    NotionSyncEngine,
+    DB_FEATURE,
+    DB_BOARD,
+    DB_SCHEDULE,
+    EVENT_ROW_CHANGES,
+    EVENT_ACTIVE_SCHEDULES,
+    _any_completed,
+    _parse_notion_dt,
+    _trim_to_minute,
+)
 from time_utils import now_kst
+from log_setup import get_logger
 
-# ===== 헬퍼 함수들 =====
+log = get_logger("notion", cog="notion_watcher")
 
-def _is_completed_status(name: str) -> bool:
-    n = (name or "").strip().lower()
-    if not n:
-        return False
-    return ("완료" in n) or (n in {"done", "completed", "complete"})
+ChangeHandler = Callable[[List[Dict[str, Any]]], Awaitable[None]]
 
-def _any_completed(status_names: List[str]) -> bool:
-    return any(_is_completed_status(n) for n in status_names)
 
-def _trim_to_minute(iso_str: str) -> str:
-    if not iso_str:
-        return ""
-    if "T" in iso_str:
-        date_part, time_part = iso_str.split("T", 1)
-        hhmm = time_part[:5]
-        return f"{date_part} {hhmm}"
-    return iso_str
+def _feature_line(item: Dict[str, Any]) -> str:
+    return f"- {item['title']} — {item['description']}"
 
-def _clean_env(val: Optional[str]) -> str:
-    return str(val).strip() if val else ""
 
 class NotionWatcherCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.db_file = "data/notion_db.json"
-        
-        self.last_notion_row_ids: Set[str] = set()
-        self.last_feature_status_by_id: Dict[str, str] = {}
-        self.last_board_row_ids: Set[str] = set()
-        self.last_schedule_row_ids: Set[str] = set()
-
-        self.load_state()
-
-    def load_state(self):
-        if not os.path.exists(self.db_file):
-            print(f"[NOTION] {self.db_file} 파일이 없어 새로 시작합니다.")
-            return
-        try:
-            with open(self.db_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.last_notion_row_ids = set(data.get("features", []))
-                self.last_feature_status_by_id = data.get("feature_statuses", {})
-                self.last_board_row_ids = set(data.get("boards", []))
-                self.last_schedule_row_ids = set(data.get("schedules", []))
-            print(f"[NOTION] {self.db_file} 로드 완료.")
-        except Exception as e:
-            print(f"[NOTION] 로드 중 오류: {e}")
-
-    def save_state(self):
-        data = {
-            "features": list(self.last_notion_row_ids),
-            "feature_statuses": self.last_feature_status_by_id,
-            "boards": list(self.last_board_row_ids),
-            "schedules": list(self.last_schedule_row_ids)
-        }
-        try:
-            os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
-            with open(self.db_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[NOTION] 저장 중 오류: {e}")
+        self.engine: Optional[NotionSyncEngine] = NotionSyncEngine() if NOTION_MODE != "ipc" else None
+        self._server: Optional[EventServer] = None
+
+        # (DB, 변경 종류) -> 핸들러 목록. 한 번의 조회에서 나온 같은 종류의 변경은 묶어서 넘깁니다.
+        self._subscribers: Dict[Tuple[str, str], List[ChangeHandler]] = {}
+        self.subscribe(DB_FEATURE, CHANGE_CREATED, self._on_feature_created)
+        self.subscribe(DB_FEATURE, CHANGE_STATUS, self._on_feature_status_changed)
+        self.subscribe(DB_BOARD, CHANGE_CREATED, self._on_board_created)
+        self.subscribe(DB_SCHEDULE, CHANGE_CREATED, self._on_schedule_created)
+        for kind in (CHANGE_CREATED, CHANGE_UPDATED, CHANGE_DELETED):
+            self.subscribe(DB_SCHEDULE, kind, self._on_schedule_changed)
+
+    def subscribe(self, db: str, kind: str, handler: ChangeHandler):
+        self._subscribers.setdefault((db, kind), []).append(handler)
 
     async def cog_load(self) -> None:
-        if NOTION_TOKEN and NOTION_DATABASE_FEATURE_ID:
+        if NOTION_MODE == "ipc":
+            try:
+                self._server = await start_event_server(self.handle_event, NOTION_IPC_BIND, NOTION_IPC_PORT, NOTION_IPC_TOKEN)
+            except ValueError as e:
+                log.error("워커 이벤트 수신 안 함: %s", e)
+                return
+            log.info("워커 이벤트 수신 대기 (%s:%s)", NOTION_IPC_BIND, NOTION_IPC_PORT)
+        elif self.engine.enabled:
             self.notion_update_poller.start()
         else:
-            print("[NOTION] 설정 부족으로 폴링 안 함")
+            log.warning("설정 부족으로 폴링 안 함")
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
         if self.notion_update_poller.is_running():
             self.notion_update_poller.cancel()
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
 
-    async def _fetch_notion_db(self, session: aiohttp.ClientSession, db_id: str) -> List[Dict[str, Any]]:
-        clean_db_id = _clean_env(db_id)
-        if not clean_db_id: return []
-        url = f"https://api.notion.com/v1/databases/{clean_db_id}/query"
-        headers = {
-            "Authorization": f"Bearer {_clean_env(NOTION_TOKEN)}",
-            "Notion-Version": "2022-06-28",
-            "Content-Type": "application/json"
+    # ===== 무중단 재배포 인계 (handoff.py) =====
+
+    async def export_state(self) -> Dict[str, Any]:
+        if self.notion_update_poller.is_running():
+            self.notion_update_poller.cancel()
+        return {
+            "engine": self.engine.export_state() if self.engine else None,
+            "schedules": self.bot.schedule_index.snapshot(),
         }
-        payload = {"page_size": 50, "sorts": [{"timestamp": "last_edited_time", "direction": "descending"}]}
-        try:
-            async with session.post(url, headers=headers, json=payload) as resp:
-                if resp.status != 200: return []
-                data = await resp.json()
-                return data.get("results", [])
-        except Exception: return []
 
-    # [핵심] 닉네임 매핑 및 스케줄 업데이트
-    async def _update_active_schedules(self, session: aiohttp.ClientSession):
-        if not NOTION_DATABASE_SCHEDULE_ID:
-            return
+    async def import_state(self, state: Dict[str, Any]):
+        if self.engine and state.get("engine"):
+            self.engine.import_state(state["engine"])
+        rows = {}
+        for rid, (users, start, end) in (state.get("schedules") or {}).items():
+            rows[rid] = (users, dt.datetime.fromisoformat(start), dt.datetime.fromisoformat(end))
+        if rows:
+            self.bot.schedule_index.replace(rows)
+        if self.engine and self.engine.enabled and not self.notion_update_poller.is_running():
+            self.notion_update_poller.start()
 
-        # [설정] 노션 이름 -> 디스코드 닉네임 변환 사전
-        NAME_MAPPING = {
-            "임아리": "이유",
-            "김성아": "SAK",
-            "장민지": "민둥"
-        }
+    async def _channel(self, channel_id: int):
+        return self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+
+    # ===== 이벤트 처리 (렌더링/전송만 담당) =====
+
+    async def handle_event(self, event: Dict[str, Any]):
+        kind = event.get("type")
+        if kind == EVENT_ACTIVE_SCHEDULES:
+            await self._apply_active_schedules(event.get("entries", []))
+        elif kind == EVENT_ROW_CHANGES:
+            db = event.get("db", "")
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            for change in event.get("changes", []):
+                grouped.setdefault(change.get("kind", ""), []).append(change)
+            for change_kind, changes in grouped.items():
+                for handler in self._subscribers.get((db, change_kind), []):
+                    await handler(changes)
+
+    async def _on_feature_created(self, changes: List[Dict[str, Any]]):
+        if not REPORT_CHANNEL_ID_FEATURE:
+            return
+        items = [c["item"] for c in changes]
+        new_req = [_feature_line(i) for i in items if not i.get("completed")]
+        new_comp = [_feature_line(i) for i in items if i.get("completed")]
+        ch = await self._channel(REPORT_CHANNEL_ID_FEATURE)
+        if new_req: await ch.send("\n".join(["기능 요청이 들어왔습니다 ✨"] + new_req))
+        if new_comp: await ch.send("\n".join(["기능이 추가됐습니다 ✅"] + new_comp))
+
+    async def _on_feature_status_changed(self, changes: List[Dict[str, Any]]):
+        if not REPORT_CHANNEL_ID_FEATURE:
+            return
+        lines = [
+            _feature_line(c["item"]) for c in changes
+            if _any_completed(c.get("new", [])) and not _any_completed(c.get("old", []))
+        ]
+        if lines:
+            ch = await self._channel(REPORT_CHANNEL_ID_FEATURE)
+            await ch.send("\n".join(["기능이 추가됐습니다 ✅"] + lines))
+
+    async def _on_board_created(self, changes: List[Dict[str, Any]]):
+        if not REPORT_CHANNEL_ID_ALARM:
+            return
+        ch = await self._channel(REPORT_CHANNEL_ID_ALARM)
+        await ch.send("게시판에 새로운 글이 올라왔습니다.")
 
-        today_str = now_kst().strftime("%Y-%m-%d")
-        clean_db_id = str(NOTION_DATABASE_SCHEDULE_ID).strip()
-        url = f"https://api.notion.com/v1/databases/{clean_db_id}/query"
-        headers = {
-            "Authorization": f"Bearer {str(NOTION_TOKEN).strip()}",
-            "Notion-Version": "2022-06-28",
-            "Content-Type": "application/json"
-        }
-        # 필터: 날짜가 오늘 이후이거나 오늘인 것
-        payload = {
-            "filter": {
-                "property": "날짜",
-                "date": {
-                    "on_or_after": today_str
-                }
-            }
-        }
+    async def _on_schedule_created(self, changes: List[Dict[str, Any]]):
+        if not REPORT_CHANNEL_ID_ALARM:
+            return
+        lines = ["새 일정이 등록되었습니다 📅"]
+        for change in changes:
+            item = change["item"]
+            s = _trim_to_minute(item.get("start"))
+            e = _trim_to_minute(item.get("end"))
+            d_str = s if not e else f"{s} ~ {e}"
+            t_str = ", ".join(item.get("tags") or []) or "(태그 없음)"
+            lines.append(f"- {t_str} — {d_str}" if d_str else f"- {t_str}")
+        ch = await self._channel(REPORT_CHANNEL_ID_ALARM)
+        await ch.send("\n".join(lines))
 
-        try:
-            async with session.post(url, headers=headers, json=payload) as resp:
-                if resp.status != 200: return
-                data = await resp.json()
-                results = data.get("results", [])
-
-                new_schedules = {}
-                now = now_kst()
-
-                for row in results:
-                    props = row.get("properties", {})
-                    
-                    # 날짜 파싱
-                    date_prop = props.get("날짜", {})
-                    if not date_prop: continue
-                    date_data = date_prop.get("date", {})
-                    if not date_data: continue
-                    end_str = date_data.get("end")
-                    if not end_str: continue 
-                    
-                    try:
-                        end_dt = dt.datetime.fromisoformat(end_str)
-                        if end_dt.tzinfo is None:
-                             KST = dt.timezone(dt.timedelta(hours=9))
-                             end_dt = end_dt.replace(tzinfo=KST)
-                    except ValueError: continue
-
-                    if end_dt < now: continue
-
-                    # 태그(이름) 파싱 및 매핑 적용
-                    tag_prop = props.get("태그", {})
-                    raw_names = []
-                    if tag_prop.get("type") == "multi_select":
-                        raw_names = [opt["name"] for opt in tag_prop.get("multi_select", [])]
-                    
-                    if not raw_names: continue
-
-                    for raw_name in raw_names:
-                        # 매핑 테이블 적용 (A -> 이유)
-                        target_name = NAME_MAPPING.get(raw_name, raw_name)
-                        
-                        target_member = None
-                        clean_target = target_name.replace(" ", "").lower()
-                        
-                        for guild in self.bot.guilds:
-                            # 1. 정확한 닉네임/이름 검색
-                            found = get(guild.members, display_name=target_name) or \
-                                    get(guild.members, name=target_name)
-                            
-                            # 2. 없으면 소문자/공백제거 후 검색
-                            if not found:
-                                for m in guild.members:
-                                    if m.bot: continue
-                                    d_name = (m.display_name or "").replace(" ", "").lower()
-                                    r_name = (m.name or "").replace(" ", "").lower()
-                                    if d_name == clean_target or r_name == clean_target:
-                                        found = m
-                                        break
-                            
-                            if found:
-                                target_member = found
-                                break
-                        
-                        if target_member:
-                            current_end = new_schedules.get(target_member.id)
-                            if not current_end or end_dt > current_end:
-                                new_schedules[target_member.id] = end_dt
-
-                self.bot.active_schedules = new_schedules
-
-        except Exception as e:
-            print(f"[NOTION] Schedule Update Error: {e}")
-
-    @tasks.loop(seconds=60)
+    # [핵심] 닉네임 매핑 및 스케줄 업데이트
+    async def _resolve_member(self, target_name: str):
+        clean_target = target_name.replace(" ", "").lower()
+
+        def is_exact(m) -> bool:
+            return m.display_name == target_name or m.name == target_name
+
+        def is_loose(m) -> bool:
+            d_name = (m.display_name or "").replace(" ", "").lower()
+            r_name = (m.name or "").replace(" ", "").lower()
+            return d_name == clean_target or r_name == clean_target
+
+        resolver = self.bot.member_resolver
+        for guild in self.bot.guilds:
+            # 1. 정확한 닉네임/이름 검색
+            # 2. 없으면 소문자/공백제거 후 검색
+            found = await resolver.find_members(guild, is_exact, query=target_name) or \
+                    await resolver.find_members(guild, is_loose, query=target_name)
+            if found:
+                return found[0]
+        return None
+
+    async def _resolve_names(self, names: List[str], cache: Dict[str, Any]) -> List[int]:
+        ids = []
+        for name in names:
+            if name not in cache:
+                cache[name] = await self._resolve_member(name)
+            if cache[name]:
+                ids.append(cache[name].id)
+        return ids
+
+    async def _apply_active_schedules(self, entries: List[Dict[str, Any]]):
+        """전체 활성 일정 목록으로 일정 인덱스를 다시 만듭니다 (주기적인 재동기화)."""
+        rows: Dict[str, Any] = {}
+        resolved: Dict[str, Any] = {}
+        for entry in entries:
+            try:
+                start_dt = dt.datetime.fromisoformat(entry["start"])
+                end_dt = dt.datetime.fromisoformat(entry["end"])
+            except (KeyError, ValueError):
+                continue
+            rid = entry.get("id") or f"{entry.get('name')}@{entry['end']}"
+            user_ids = await self._resolve_names([entry.get("name", "")], resolved)
+            users, _, _ = rows.get(rid, ([], start_dt, end_dt))
+            rows[rid] = (users + user_ids, start_dt, end_dt)
+        self.bot.schedule_index.replace(rows)
+
+    async def _on_schedule_changed(self, changes: List[Dict[str, Any]]):
+        """일정 행 추가/수정/삭제를 인덱스에 바로 반영합니다."""
+        index = self.bot.schedule_index
+        now = now_kst()
+        resolved: Dict[str, Any] = {}
+        for change in changes:
+            if change.get("kind") == CHANGE_DELETED:
+                index.remove(change["id"])
+                continue
+            item = change.get("item") or {}
+            start_dt = _parse_notion_dt(item.get("start"))
+            end_dt = _parse_notion_dt(item.get("end"))
+            if not end_dt or end_dt < now:
+                index.remove(change["id"])
+                continue
+            user_ids = await self._resolve_names(item.get("names") or [], resolved)
+            index.upsert(change["id"], user_ids, start_dt or end_dt, end_dt)
+        index.prune(now)
+
+    # ===== 프로세스 내부 폴링 모드 =====
+
+    # DB 별 적응형 간격은 엔진이 관리하고, 루프는 다음 조회 시점까지 쉬도록 간격을 매번 조정합니다.
+    @tasks.loop(seconds=NOTION_POLL_MIN_SECONDS)
     async def notion_update_poller(self):
-        if not NOTION_TOKEN: return
+        started = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
-                # [추가] 스케줄 업데이트 호출
-                await self._update_active_schedules(session)
-
-                # Feature DB
-                if NOTION_DATABASE_FEATURE_ID:
-                    rows = await self._fetch_notion_db(session, NOTION_DATABASE_FEATURE_ID)
-                    new_row_ids = {row["id"] for row in rows}
-                    only_new = new_row_ids - self.last_notion_row_ids
-                    
-                    if only_new:
-                        await asyncio.sleep(20)
-                        rows = await self._fetch_notion_db(session, NOTION_DATABASE_FEATURE_ID)
-
-                    if only_new:
-                        new_req = []
-                        new_comp = []
-                        for row in rows:
-                            if row["id"] not in only_new: continue
-                            rid = row["id"]
-                            props = row.get("properties", {})
-                            
-                            status_names = []
-                            st = props.get("상태")
-                            if not st:
-                                for v in props.values():
-                                    if isinstance(v, dict) and v.get("type") in ("status", "select", "multi_select"): st=v; break
-                            if st:
-                                t = st.get("type")
-                                if t == "status":
-                                    n = st.get("status", {}).get("name")
-                                    if n: status_names.append(n)
-                                elif t == "select":
-                                    n = st.get("select", {}).get("name")
-                                    if n: status_names.append(n)
-                                elif t == "multi_select":
-                                    for o in st.get("multi_select", []):
-                                        if o.get("name"): status_names.append(o.get("name"))
-
-                            c_txt = "(내용 없음)"
-                            cp = props.get("내용")
-                            if cp and cp.get("type") == "title": c_txt = "".join([x.get("plain_text","") for x in cp.get("title",[])]).strip() or "(내용 없음)"
-                            elif cp and cp.get("type") == "rich_text": c_txt = "".join([x.get("plain_text","") for x in cp.get("rich_text",[])]).strip() or "(내용 없음)"
-                            
-                            d_txt = "(설명 없음)"
-                            dp = props.get("설명") or props.get("Description")
-                            if dp and dp.get("type") == "rich_text": d_txt = "".join([x.get("plain_text","") for x in dp.get("rich_text",[])]).strip() or "(설명 없음)"
-
-                            line = f"- {c_txt} — {d_txt}"
-                            if _any_completed(status_names): new_comp.append(line)
-                            else: new_req.append(line)
-                            if status_names: self.last_feature_status_by_id[rid] = ",".join(status_names)
-
-                        ch = self.bot.get_channel(REPORT_CHANNEL_ID_FEATURE) or await self.bot.fetch_channel(REPORT_CHANNEL_ID_FEATURE)
-                        if new_req: await ch.send("\n".join(["기능 요청이 들어왔습니다 ✨"] + new_req))
-                        if new_comp: await ch.send("\n".join(["기능이 추가됐습니다 ✅"] + new_comp))
-
-                    st_change = []
-                    for row in rows:
-                        rid = row["id"]
-                        props = row.get("properties", {})
-                        status_names = []
-                        st = props.get("상태")
-                        if not st:
-                            for v in props.values():
-                                if isinstance(v, dict) and v.get("type") in ("status", "select", "multi_select"): st=v; break
-                        if st:
-                            t = st.get("type")
-                            if t == "status": n=st.get("status", {}).get("name"); status_names.append(n) if n else None
-                            elif t == "select": n=st.get("select", {}).get("name"); status_names.append(n) if n else None
-                            elif t == "multi_select": [status_names.append(o["name"]) for o in st.get("multi_select",[]) if o.get("name")]
-
-                        prev = self.last_feature_status_by_id.get(rid)
-                        if prev is None:
-                            if status_names: self.last_feature_status_by_id[rid] = ",".join(status_names)
-                            continue
-
-                        prev_c = _any_completed([p.strip() for p in (prev.split(",") if prev else [])])
-                        curr_c = _any_completed(status_names)
-
-                        if curr_c and not prev_c:
-                            c_txt = "(내용 없음)"
-                            cp = props.get("내용")
-                            if cp and cp.get("type") == "title": c_txt = "".join([x.get("plain_text","") for x in cp.get("title",[])]).strip() or "(내용 없음)"
-                            elif cp and cp.get("type") == "rich_text": c_txt = "".join([x.get("plain_text","") for x in cp.get("rich_text",[])]).strip() or "(내용 없음)"
-                            
-                            d_txt = "(설명 없음)"
-                            dp = props.get("설명") or props.get("Description")
-                            if dp and dp.get("type") == "rich_text": d_txt = "".join([x.get("plain_text","") for x in dp.get("rich_text",[])]).strip() or "(설명 없음)"
-                            st_change.append(f"- {c_txt} — {d_txt}")
-
-                        if status_names: self.last_feature_status_by_id[rid] = ",".join(status_names)
-
-                    if st_change:
-                        ch = self.bot.get_channel(REPORT_CHANNEL_ID_FEATURE) or await self.bot.fetch_channel(REPORT_CHANNEL_ID_FEATURE)
-                        await ch.send("\n".join(["기능이 추가됐습니다 ✅"] + st_change))
-                    
-                    if only_new or st_change or (new_row_ids != self.last_notion_row_ids):
-                        self.last_notion_row_ids = new_row_ids
-                        self.save_state()
-
-                # Board DB
-                if NOTION_DATABASE_BOARD_ID and REPORT_CHANNEL_ID_ALARM:
-                    rows = await self._fetch_notion_db(session, NOTION_DATABASE_BOARD_ID)
-                    ids = {r["id"] for r in rows}
-                    new_ids = ids - self.last_board_row_ids
-                    if new_ids:
-                        ch = self.bot.get_channel(REPORT_CHANNEL_ID_ALARM) or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ALARM)
-                        await ch.send("게시판에 새로운 글이 올라왔습니다.")
-                        self.last_board_row_ids = ids
-                        self.save_state()
-
-                # Schedule DB (기존 새 일정 알림용)
-                if NOTION_DATABASE_SCHEDULE_ID and REPORT_CHANNEL_ID_ALARM:
-                    rows = await self._fetch_notion_db(session, NOTION_DATABASE_SCHEDULE_ID)
-                    ids = {r["id"] for r in rows}
-                    new_ids = ids - self.last_schedule_row_ids
-                    if new_ids:
-                        await asyncio.sleep(20)
-                        rows = await self._fetch_notion_db(session, NOTION_DATABASE_SCHEDULE_ID)
-                        ids = {r["id"] for r in rows}
-                        new_ids = ids - self.last_schedule_row_ids
-                        
-                        if new_ids:
-                            lines = ["새 일정이 등록되었습니다 📅"]
-                            for row in rows:
-                                if row["id"] not in new_ids: continue
-                                props = row.get("properties", {})
-                                d_str = ""
-                                dp = props.get("날짜")
-                                if not dp:
-                                    for v in props.values():
-                                        if isinstance(v, dict) and v.get("type") == "date": dp=v; break
-                                if dp and dp.get("type")=="date":
-                                    d = dp.get("date") or {}
-                                    s = _trim_to_minute(d.get("start"))
-                                    e = _trim_to_minute(d.get("end"))
-                                    d_str = s if not e else f"{s} ~ {e}"
-                                tags = []
-                                tp = props.get("태그")
-                                if not tp:
-                                    for v in props.values():
-                                        if isinstance(v, dict) and v.get("type") == "multi_select": tp=v; break
-                                if tp and tp.get("type")=="multi_select":
-                                    for o in tp.get("multi_select",[]):
-                                        if o.get("name"): tags.append(o.get("name"))
-                                t_str = ", ".join(tags) if tags else "(태그 없음)"
-                                lines.append(f"- {t_str} — {d_str}" if d_str else f"- {t_str}")
-
-                            ch = self.bot.get_channel(REPORT_CHANNEL_ID_ALARM) or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ALARM)
-                            await ch.send("\n".join(lines))
-                            
-                        self.last_schedule_row_ids = ids
-                        self.save_state()
-
-        except Exception as e:
-            print(f"[NOTION] Error: {e}")
+                for event in await self.engine.poll_due(session):
+                    try:
+                        await self.handle_event(event)
+                    except Exception:
+                        log.exception("이벤트 처리 오류 (%s)", event.get("type"), extra={"event": event.get("type")})
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("폴링 완료", extra={
+                    "event": "notion_poll",
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                })
+        except Exception:
+            log.exception("폴링 오류", extra={"event": "notion_poll"})
+        finally:
+            self.notion_update_poller.change_interval(seconds=max(1.0, self.engine.seconds_until_next_due()))
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(NotionWatcherCog(bot))
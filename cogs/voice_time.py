@@ -1,30 +1,213 @@
 # cogs/voice_time.py
 import datetime as dt
 import asyncio  # [추가] 딜레이 기능을 위해 필요
-from typing import List
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
-from config import VOICE_CHANNEL_ID, REPORT_CHANNEL_ID_ENTER, DATA_FILE, REPORT_CHANNEL_ID_ALARM
-from time_utils import now_kst, iso
+from config import (
+    VOICE_CHANNEL_ID,
+    REPORT_CHANNEL_ID_ENTER,
+    DATA_FILE,
+    SESSION_LOG_FILE,
+    REPORT_CHANNEL_ID_ALARM,
+    SCHEDULE_START_GRACE_SECONDS,
+    VOICE_GRACE_SECONDS,
+    WEEKLY_REPORT_CRON,
+    REPORT_TIMEZONE,
+)
+from time_utils import KST, now_kst, iso, parse_iso
 from state_store import StateStore
+from voice_normalizer import ENTER, VoiceEventNormalizer
+import voice_export
+from log_setup import get_logger
+
+log = get_logger("voice", cog="voice_time")
 
 COOLDOWN_SECONDS = 10 * 60  # 10분
+LEAVE_ALARM_DELAY_SECONDS = 30  # 퇴장 후 일정 알림까지 대기 시간
+WEEKLY_REPORT_JOB = "weekly_voice_report"
 
 class VoiceTimeCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.store = StateStore(DATA_FILE)
+        self.store = StateStore(DATA_FILE, SESSION_LOG_FILE)
         self.store.load()
 
         self.channel_active = False
         self.last_alert_time: dt.datetime | None = None
+        self.normalizer = VoiceEventNormalizer(VOICE_GRACE_SECONDS, self._commit_enter, self._commit_leave)
+        # 퇴장 후 일정 알림 대기: member_id -> (guild_id, 퇴장 시각, 알림 task)
+        self._leave_alarms: Dict[int, Tuple[int, dt.datetime, asyncio.Task]] = {}
+        # 무중단 재배포로 상태를 넘긴 뒤에는 이벤트를 더 처리하지 않습니다.
+        self.draining = False
+        # 넘겨받았지만 아직 normalizer 에 되돌리지 못한 전환 (봇 준비 전에는 멤버를 찾을 수 없음)
+        self._restored_pending: List[Dict[str, Any]] = []
+
+        # 일정 시작 알림용: 일정 인덱스가 바뀌면 다음 시작 시각 타이머를 다시 잡습니다.
+        self._schedule_changed = asyncio.Event()
+        self._start_alert_task: asyncio.Task | None = None
+        self.bot.schedule_index.add_listener(self._schedule_changed.set)
+
+    async def cog_load(self):
+        self._start_alert_task = asyncio.create_task(self._start_alert_loop())
+        # 주간 리포트 + 누적 초기화. 봇이 꺼져 있던 사이 지나간 회차는 등록 즉시 실행됩니다.
+        self.bot.scheduler.add_job(WEEKLY_REPORT_JOB, WEEKLY_REPORT_CRON, self._weekly_report, tz=REPORT_TIMEZONE)
 
-        self.daily_reporter.start()
+    async def cog_unload(self):
+        self.bot.scheduler.remove_job(WEEKLY_REPORT_JOB)
+        # 확정 대기 중인 입장/퇴장은 종료 전에 바로 반영
+        await self.normalizer.flush()
+        self.bot.schedule_index.remove_listener(self._schedule_changed.set)
+        if self._start_alert_task:
+            self._start_alert_task.cancel()
+        for *_, task in self._leave_alarms.values():
+            task.cancel()
+        self._leave_alarms.clear()
 
-    def cog_unload(self):
-        self.daily_reporter.cancel()
+    # ===== 무중단 재배포 인계 (handoff.py) =====
+
+    async def export_state(self) -> Dict[str, Any]:
+        """이벤트 처리를 멈추고, 진행 중인 세션/grace 대기 중인 전환/대기 중인 퇴장 알림을 넘깁니다.
+        대기 중인 전환은 여기서 확정하지 않고 그대로 넘겨, 재접속 중인 세션이 끊기지 않게 합니다.
+        저장 같은 부수 작업이 실패해도 메모리 상태는 그대로 넘깁니다."""
+        self.draining = True
+        self.bot.scheduler.remove_job(WEEKLY_REPORT_JOB)
+        pending = [
+            {"kind": kind, "user_id": member.id, "guild_id": member.guild.id, "at": iso(at)}
+            for kind, member, _, at in self.normalizer.take_pending()
+        ] + self._restored_pending
+        self._restored_pending = []
+        alarms = [
+            {"user_id": uid, "guild_id": guild_id, "left_at": iso(at)}
+            for uid, (guild_id, at, _) in self._leave_alarms.items()
+        ]
+        for *_, task in self._leave_alarms.values():
+            task.cancel()
+        self._leave_alarms.clear()
+        try:
+            self.store.save()
+        except Exception:
+            log.exception("인계 전 저장 실패 (상태는 스냅샷으로 넘깁니다)", extra={"event": "handoff"})
+        return {
+            "totals": dict(self.store.state["totals"]),
+            "sessions": dict(self.store.state["sessions"]),
+            "channel_active": self.channel_active,
+            "last_alert_time": iso(self.last_alert_time) if self.last_alert_time else None,
+            "leave_alarms": alarms,
+            "pending": pending,
+        }
+
+    async def import_state(self, state: Dict[str, Any]):
+        self.store.state["totals"] = state.get("totals", {})
+        self.store.state["sessions"] = state.get("sessions", {})
+        self.store.save()
+        self.channel_active = state.get("channel_active", False)
+        last = state.get("last_alert_time")
+        self.last_alert_time = parse_iso(last) if last else None
+        for alarm in state.get("leave_alarms", []):
+            self._arm_leave_alarm(alarm["user_id"], alarm["guild_id"], parse_iso(alarm["left_at"]))
+        if self.draining:
+            # 인계가 실패해 이 인스턴스가 계속 실행되는 경우
+            self.bot.scheduler.add_job(WEEKLY_REPORT_JOB, WEEKLY_REPORT_CRON, self._weekly_report, tz=REPORT_TIMEZONE)
+        self.draining = False
+        self._restored_pending = list(state.get("pending", []))
+        if self.bot.is_ready():
+            self._restore_pending()
+            self._reconcile_sessions()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._restore_pending()
+        self._reconcile_sessions()
+
+    def _restore_pending(self):
+        """넘겨받은 grace 대기 전환을 normalizer 에 되돌립니다.
+        그 사이 실제 상태가 원래대로 돌아왔으면(짧은 재접속) 상쇄된 것으로 보고 버리고,
+        멤버를 찾을 수 없으면 _reconcile_sessions 에 맡깁니다."""
+        pending, self._restored_pending = self._restored_pending, []
+        voice_channel = self.bot.get_channel(VOICE_CHANNEL_ID)
+        if not voice_channel:
+            return
+        present = {m.id for m in voice_channel.members if not m.bot}
+        for entry in pending:
+            uid = entry["user_id"]
+            if (entry["kind"] == ENTER) != (uid in present):
+                continue
+            member = self.bot.member_resolver.get_member(voice_channel.guild, uid)
+            if member is not None:
+                self.normalizer.restore(entry["kind"], member, voice_channel, parse_iso(entry["at"]))
+
+    def _reconcile_sessions(self):
+        """재시작/인계/cog 재로드 사이에 놓친 입장·퇴장을 실제 음성 채널 상태와 맞춥니다."""
+        voice_channel = self.bot.get_channel(VOICE_CHANNEL_ID)
+        if not voice_channel or self.draining:
+            return
+        now = now_kst()
+        present = {m.id for m in voice_channel.members if not m.bot}
+        sessions = self.store.state["sessions"]
+        changed = 0
+        for uid in list(sessions):
+            if int(uid) not in present and not self.normalizer.is_pending(int(uid)):
+                self.store.add_session_time(int(uid), until=now)
+                sessions.pop(uid, None)
+                changed += 1
+        for member_id in present:
+            if str(member_id) not in sessions and not self.normalizer.is_pending(member_id):
+                sessions[str(member_id)] = iso(now)
+                changed += 1
+        self.channel_active = bool(present)
+        if changed:
+            self.store.save()
+            log.info("음성 채널 상태와 세션 %d건 맞춤", changed, extra={"event": "reconcile"})
+
+    async def _start_alert_loop(self):
+        """가장 가까운 일정 시작 시각까지 잠들었다가, 그때 음성 채널에 없는 사람에게 알림을 보냅니다."""
+        await self.bot.wait_until_ready()
+        last_fired = now_kst()
+        grace = dt.timedelta(seconds=SCHEDULE_START_GRACE_SECONDS)
+        while True:
+            self._schedule_changed.clear()
+            upcoming = self.bot.schedule_index.next_start(last_fired)
+            timeout = None
+            if upcoming:
+                timeout = max(0.0, (upcoming[0] + grace - now_kst()).total_seconds())
+            try:
+                await asyncio.wait_for(self._schedule_changed.wait(), timeout=timeout)
+                continue  # 일정이 바뀜 -> 다음 시작 시각 다시 계산
+            except asyncio.TimeoutError:
+                pass
+
+            start, user_ids = upcoming
+            last_fired = start
+            try:
+                await self._send_start_alerts(user_ids)
+            except Exception:
+                log.exception("일정 시작 알림 실패", extra={"event": "schedule_start_alert"})
+
+    async def _send_start_alerts(self, user_ids: List[int]):
+        if not REPORT_CHANNEL_ID_ALARM:
+            return
+        now = now_kst()
+        voice_channel = self.bot.get_channel(VOICE_CHANNEL_ID)
+        in_channel = {m.id for m in voice_channel.members} if voice_channel else set()
+
+        lines = []
+        for uid in user_ids:
+            window = self.bot.schedule_index.current_window(uid, now)
+            if uid in in_channel or not window:
+                continue
+            lines.append(f"⏰ <@{uid}> 님, 일정이 시작됐어요! 음성 채널에 들어와 주세요. (종료 {window[1].strftime('%H:%M')})")
+        if not lines:
+            return
+        alarm_ch = self.bot.get_channel(REPORT_CHANNEL_ID_ALARM) \
+                   or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ALARM)
+        await alarm_ch.send("\n".join(lines))
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -33,102 +216,144 @@ class VoiceTimeCog(commands.Cog):
         before: discord.VoiceState,
         after: discord.VoiceState,
     ):
+        if self.draining:
+            return
+        started = time.perf_counter()
         target_id = VOICE_CHANNEL_ID
-        uid = str(member.id)
+        resolver = self.bot.member_resolver
+        resolver.remember(member)
 
         before_id = before.channel.id if before.channel else None
         after_id = after.channel.id if after.channel else None
 
-        # 1. 입장 (Enter)
+        # 짧은 퇴장 -> 재입장은 normalizer 가 하나의 세션으로 합치고,
+        # grace 시간 동안 유지된 전환만 아래 _commit_enter / _commit_leave 로 넘어옵니다.
         if before_id != target_id and after_id == target_id:
-            self.store.state["sessions"][uid] = iso(now_kst())
-            self.store.save()
+            await self.normalizer.feed_enter(member, after.channel, now_kst())
+        elif before_id == target_id and after_id != target_id:
+            await self.normalizer.feed_leave(member, before.channel, now_kst())
 
-            voice_channel = after.channel
-            guild = member.guild
-            if not voice_channel or not guild:
-                return
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("음성 상태 변경 %s -> %s (%s)", before_id, after_id, member.id, extra={
+                "event": "voice_state_update",
+                "guild": member.guild.id,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            })
 
-            members_in_channel = [m for m in voice_channel.members if not m.bot]
+    # 1. 입장 (Enter)
+    async def _commit_enter(self, member: discord.Member, voice_channel, at: dt.datetime):
+        uid = str(member.id)
+        resolver = self.bot.member_resolver
+        self.store.state["sessions"][uid] = iso(at)
+        self.store.save()
 
-            now = now_kst()
-            cooldown_ok = (
-                self.last_alert_time is None
-                or (now - self.last_alert_time).total_seconds() > COOLDOWN_SECONDS
-            )
+        guild = member.guild
+        if not voice_channel or not guild:
+            return
 
-            if not self.channel_active and members_in_channel and cooldown_ok:
-                self.channel_active = True
-                self.last_alert_time = now
+        members_in_channel = [m for m in voice_channel.members if not m.bot]
 
-                await discord.utils.sleep_until(discord.utils.utcnow() + dt.timedelta(seconds=1))
+        now = now_kst()
+        cooldown_ok = (
+            self.last_alert_time is None
+            or (now - self.last_alert_time).total_seconds() > COOLDOWN_SECONDS
+        )
 
-                members_not_in_channel = [
-                    m for m in guild.members
-                    if not m.bot and m not in voice_channel.members
-                ]
+        if not self.channel_active and members_in_channel and cooldown_ok:
+            self.channel_active = True
+            self.last_alert_time = now
 
-                report_ch = self.bot.get_channel(REPORT_CHANNEL_ID_ENTER) \
-                    or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ENTER)
-                header = f'음성 채널 **{voice_channel.name}**에 멤버가 있습니다!'
+            await discord.utils.sleep_until(discord.utils.utcnow() + dt.timedelta(seconds=1))
 
-                if members_not_in_channel:
-                    await self._send_mentions_in_chunks(report_ch, members_not_in_channel, header_text=header)
-                else:
-                    await report_ch.send(header)
-            return
+            in_channel_ids = {m.id for m in voice_channel.members}
+            members_not_in_channel = [
+                m for m in await resolver.all_members(guild)
+                if not m.bot and m.id not in in_channel_ids
+            ]
 
-        # 2. 퇴장 (Leave)
-        if before_id == target_id and after_id != target_id:
-            # 세션 기록 저장
-            self.store.add_session_time(member.id)
-            self.store.state["sessions"].pop(uid, None)
-            self.store.save()
+            report_ch = self.bot.get_channel(REPORT_CHANNEL_ID_ENTER) \
+                or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ENTER)
+            header = f'음성 채널 **{voice_channel.name}**에 멤버가 있습니다!'
 
-            if before.channel and len([m for m in before.channel.members if not m.bot]) == 0:
-                self.channel_active = False
-
-            # [핵심] 30초 딜레이 후 알림 발송 로직
-            if hasattr(self.bot, 'active_schedules') and member.id in self.bot.active_schedules:
-                # 30초 대기
-                await asyncio.sleep(30)
-
-                # 30초 후 현재 상태 다시 확인 (유저가 다시 들어왔는지 체크)
-                # member 객체는 옛날 정보일 수 있으므로, 길드에서 최신 멤버 정보를 다시 가져옴
-                current_member = member.guild.get_member(member.id)
-                
-                # 유저가 서버를 나갔거나(None), 
-                # 음성 채널에 없거나, 
-                # 음성 채널에 있어도 우리 타겟 채널이 아니라면 -> 알림 발송 대상
-                is_back_in_channel = False
-                if current_member and current_member.voice and current_member.voice.channel:
-                    if current_member.voice.channel.id == target_id:
-                        is_back_in_channel = True
-                
-                # 이미 돌아왔다면 알림 취소
-                if is_back_in_channel:
-                    return
-
-                # 여전히 나가 있다면 일정 체크 후 알림
-                scheduled_end = self.bot.active_schedules[member.id]
-                now = now_kst()
-                
-                if now < scheduled_end:
-                    time_diff = scheduled_end - now
-                    minutes_left = int(time_diff.total_seconds() / 60)
-                    
-                    if minutes_left > 1:
-                        alarm_ch = self.bot.get_channel(REPORT_CHANNEL_ID_ALARM) \
-                                   or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ALARM)
-                        
-                        if alarm_ch:
-                            msg = (
-                                f"🚨 **{member.mention} 님, 어디 가시나요?**\n"
-                                f"아직 일정이 **{minutes_left}분** 남았습니다!\n"
-                                f"목표 시간: {scheduled_end.strftime('%H:%M')}"
-                            )
-                            await alarm_ch.send(msg)
-            return
+            if members_not_in_channel:
+                await self._send_mentions_in_chunks(report_ch, members_not_in_channel, header_text=header)
+            else:
+                await report_ch.send(header)
+
+    # 2. 퇴장 (Leave)
+    async def _commit_leave(self, member: discord.Member, voice_channel, at: dt.datetime):
+        uid = str(member.id)
+
+        # 세션 기록 저장 (실제로 나간 시각 기준)
+        self.store.add_session_time(member.id, until=at)
+        self.store.state["sessions"].pop(uid, None)
+        self.store.save()
+
+        if voice_channel and len([m for m in voice_channel.members if not m.bot]) == 0:
+            self.channel_active = False
+
+        # [핵심] 30초 딜레이 후 알림 발송 로직 (지금이 실제 일정 구간 안일 때만)
+        if self.bot.schedule_index.current_window(member.id, now_kst()):
+            self._arm_leave_alarm(member.id, member.guild.id, at)
+
+    def _arm_leave_alarm(self, member_id: int, guild_id: int, at: dt.datetime):
+        prev = self._leave_alarms.pop(member_id, None)
+        if prev:
+            prev[2].cancel()
+        task = asyncio.create_task(self._leave_alarm(member_id, guild_id, at))
+        self._leave_alarms[member_id] = (guild_id, at, task)
+
+    async def _leave_alarm(self, member_id: int, guild_id: int, at: dt.datetime):
+        try:
+            # normalizer 의 grace 시간만큼은 이미 기다렸으므로 그만큼 덜 기다립니다.
+            await asyncio.sleep(max(0.0, LEAVE_ALARM_DELAY_SECONDS - (now_kst() - at).total_seconds()))
+            await self.bot.wait_until_ready()
+
+            # 30초 후 현재 상태 다시 확인 (유저가 다시 들어왔는지 체크)
+            # member 객체는 옛날 정보일 수 있으므로, 길드에서 최신 멤버 정보를 다시 가져옴
+            guild = self.bot.get_guild(guild_id)
+            current_member = self.bot.member_resolver.get_member(guild, member_id) if guild else None
+
+            # 유저가 서버를 나갔거나(None),
+            # 음성 채널에 없거나,
+            # 음성 채널에 있어도 우리 타겟 채널이 아니라면 -> 알림 발송 대상
+            is_back_in_channel = False
+            if current_member and current_member.voice and current_member.voice.channel:
+                if current_member.voice.channel.id == VOICE_CHANNEL_ID:
+                    is_back_in_channel = True
+
+            # 이미 돌아왔다면 알림 취소
+            if is_back_in_channel:
+                return
+
+            # 여전히 나가 있다면 일정 체크 후 알림
+            now = now_kst()
+            window = self.bot.schedule_index.current_window(member_id, now)
+
+            if window:
+                scheduled_end = window[1]
+                time_diff = scheduled_end - now
+                minutes_left = int(time_diff.total_seconds() / 60)
+
+                if minutes_left > 1:
+                    alarm_ch = self.bot.get_channel(REPORT_CHANNEL_ID_ALARM) \
+                               or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ALARM)
+
+                    if alarm_ch:
+                        msg = (
+                            f"🚨 **<@{member_id}> 님, 어디 가시나요?**\n"
+                            f"아직 일정이 **{minutes_left}분** 남았습니다!\n"
+                            f"목표 시간: {scheduled_end.strftime('%H:%M')}"
+                        )
+                        await alarm_ch.send(msg)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("퇴장 알림 실패 (%s)", member_id, extra={"event": "leave_alarm", "guild": guild_id})
+        finally:
+            entry = self._leave_alarms.get(member_id)
+            if entry and entry[2] is asyncio.current_task():
+                del self._leave_alarms[member_id]
 
     async def _send_mentions_in_chunks(
         self,
@@ -143,15 +368,16 @@ class VoiceTimeCog(commands.Cog):
             text = f"{mention_list}\n{header_text}" if header_text else mention_list
             await report_ch.send(text)
 
-    @tasks.loop(time=dt.time(hour=14, minute=0, tzinfo=dt.timezone.utc))
-    async def daily_reporter(self):
+    async def _weekly_report(self, scheduled: dt.datetime):
+        """주간 리포트를 보내고 누적 시간을 초기화합니다 (job_scheduler 가 호출)."""
+        await self.bot.wait_until_ready()
         now = now_kst()
-        if now.weekday() != 6:
-            return
-
-        for uid in list(self.store.state["sessions"].keys()):
-            self.store.add_session_time(int(uid), until=now)
-            self.store.state["sessions"][uid] = iso(now)
+        # 놓친 회차를 늦게 실행하는 경우에도 진행 중인 세션은 예정 시각에서 끊어 다음 주로 넘깁니다.
+        cutoff = min(now, scheduled)
+        for uid, start_iso in list(self.store.state["sessions"].items()):
+            if parse_iso(start_iso) < cutoff:
+                self.store.add_session_time(int(uid), until=cutoff)
+                self.store.state["sessions"][uid] = iso(cutoff)
 
         if not self.store.state["totals"]:
             content = "이번 주 대상 음성 채널 체류 기록이 없습니다."
@@ -162,6 +388,8 @@ class VoiceTimeCog(commands.Cog):
                 hours = sec / 3600.0
                 lines.append(f"- <@{uid}>: {hours:.2f}h")
             content = "\n".join(lines)
+        if (now - scheduled).total_seconds() > 60:
+            content += f"\n(봇이 꺼져 있어 늦게 보냅니다. 원래 발송 시각: {scheduled.astimezone(KST).strftime('%m/%d %H:%M')})"
 
         channel = self.bot.get_channel(REPORT_CHANNEL_ID_ENTER) \
             or await self.bot.fetch_channel(REPORT_CHANNEL_ID_ENTER)
@@ -184,7 +412,60 @@ class VoiceTimeCog(commands.Cog):
             lines.append(f"<@{uid}>: {hours:.2f}h")
         await ctx.send("\n".join(lines))
 
+    def _build_export(self, out_path: str, start: dt.datetime, end: dt.datetime, fmt: str, kind: str,
+                      open_sessions: dict, now: dt.datetime) -> int:
+        # 별도 스레드에서 실행됩니다 (이벤트 루프를 막지 않도록)
+        sessions = voice_export.iter_sessions(self.store.log_file, start, end, open_sessions, now)
+        if kind == "totals":
+            return voice_export.write_export(out_path, voice_export.iter_totals(sessions), fmt, voice_export.TOTAL_COLUMNS)
+        return voice_export.write_export(out_path, sessions, fmt, voice_export.SESSION_COLUMNS)
+
+    @commands.command(name="export")
+    @commands.has_permissions(administrator=True)
+    async def export(self, ctx: commands.Context, start: str = None, end: str = None,
+                     fmt: str = "csv", kind: str = "sessions"):
+        """!export [시작일] [종료일] [csv|jsonl] [sessions|totals]  (날짜는 YYYY-MM-DD, 기본: 최근 7일)"""
+        fmt, kind = fmt.lower(), kind.lower()
+        if fmt not in voice_export.FORMATS or kind not in voice_export.KINDS:
+            await ctx.send("사용법: `!export [시작일] [종료일] [csv|jsonl] [sessions|totals]`")
+            return
+
+        now = now_kst()
+        try:
+            end_day = dt.date.fromisoformat(end) if end else now.date()
+            start_day = dt.date.fromisoformat(start) if start else end_day - dt.timedelta(days=6)
+        except ValueError:
+            await ctx.send("날짜는 YYYY-MM-DD 형식으로 입력하세요.")
+            return
+        if start_day > end_day:
+            await ctx.send("시작일이 종료일보다 늦습니다.")
+            return
+        start_dt = dt.datetime.combine(start_day, dt.time(), tzinfo=KST)
+        end_dt = dt.datetime.combine(end_day + dt.timedelta(days=1), dt.time(), tzinfo=KST)
+
+        filename = f"voice_{kind}_{start_day}_{end_day}.{fmt}.gz"
+        fd, out_path = tempfile.mkstemp(suffix=".gz")
+        os.close(fd)
+        try:
+            rows = await asyncio.to_thread(
+                self._build_export, out_path, start_dt, end_dt, fmt, kind,
+                dict(self.store.state["sessions"]), now,
+            )
+            size = os.path.getsize(out_path)
+            limit = ctx.guild.filesize_limit if ctx.guild else 8 * 1024 * 1024
+            if size > limit:
+                await ctx.send(f"파일이 너무 큽니다 ({size / 1024 / 1024:.1f}MB). 기간을 줄여 주세요.")
+                return
+            await ctx.send(
+                f"{start_day} ~ {end_day} 기록 {rows}건을 내보냈습니다.",
+                file=discord.File(out_path, filename=filename),
+            )
+        finally:
+            try:
+                os.remove(out_path)
+            except OSError:
+                pass
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(VoiceTimeCog(bot))
-    
\ No newline at end of file
@@ -1,10 +1,11 @@
 # config.py
+import logging
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
 env_path = Path(__file__).resolve().parent / ".env"
-print(f"[DEBUG] loading env from {env_path}")
+logging.getLogger("config").debug("loading env from %s", env_path)
 load_dotenv(dotenv_path=env_path, override=True)
 
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN", "")
@@ -12,6 +13,8 @@ VOICE_CHANNEL_ID = int(os.getenv("VOICE_CHANNEL_ID", "0"))
 REPORT_CHANNEL_ID_ENTER = int(os.getenv("REPORT_CHANNEL_ID_ENTER", "0"))
 REPORT_CHANNEL_ID_TOEIC = int(os.getenv("REPORT_CHANNEL_ID_TOEIC", "0"))
 DATA_FILE = os.getenv("DATA_FILE", "voice_time.json")
+# 끝난 세션 기록 (!export 원본). 재빌드/재배포에도 남도록 data 볼륨 안에 둡니다.
+SESSION_LOG_FILE = os.getenv("SESSION_LOG_FILE", "data/voice_sessions.jsonl")
 MENTION_CHANNEL_ID = int(os.getenv("MENTION_CHANNEL_ID", "0"))
 NOTION_TOKEN = os.getenv("NOTION_TOKEN", "")
 NOTION_DATABASE_FEATURE_ID = os.getenv("NOTION_DATABASE_FEATURE_ID", "")
@@ -21,6 +24,50 @@ NOTION_DATABASE_BOARD_ID = os.getenv("NOTION_DATABASE_BOARD_ID", "")
 REPORT_CHANNEL_ID_ALARM = int(os.getenv("REPORT_CHANNEL_ID_ALARM", "0"))
 NOTION_DATABASE_SCHEDULE_ID = os.getenv("NOTION_DATABASE_SCHEDULE_ID", "")
 
+# 노션 폴링 실행 방식: inprocess(봇 안에서 폴링) / ipc(별도 워커 프로세스가 로컬 소켓으로 이벤트 전송)
+NOTION_MODE = os.getenv("NOTION_MODE", "inprocess").strip().lower()
+NOTION_WORKER_SPAWN = os.getenv("NOTION_WORKER_SPAWN", "0").strip().lower() in {"1", "true", "yes"}
+NOTION_IPC_BIND = os.getenv("NOTION_IPC_BIND", "127.0.0.1")   # 봇이 수신 대기할 주소
+NOTION_IPC_HOST = os.getenv("NOTION_IPC_HOST", "127.0.0.1")   # 워커가 접속할 봇 주소
+NOTION_IPC_PORT = int(os.getenv("NOTION_IPC_PORT", "8765"))
+NOTION_IPC_TOKEN = os.getenv("NOTION_IPC_TOKEN", "")
+
+# 노션 DB 별 적응형 폴링 간격 (초): 변경 직후 최소 간격, 조용하면 최대 간격까지 두 배씩 늘어남
+NOTION_POLL_MIN_SECONDS = float(os.getenv("NOTION_POLL_MIN_SECONDS", "15"))
+NOTION_POLL_MAX_SECONDS = float(os.getenv("NOTION_POLL_MAX_SECONDS", "900"))
+# 일정 시작/종료 몇 초 전에 일정 DB 를 미리 조회할지
+NOTION_SCHEDULE_LEAD_SECONDS = float(os.getenv("NOTION_SCHEDULE_LEAD_SECONDS", "120"))
+
+# 음성 채널 퇴장 -> 재입장이 이 시간(초) 안이면 하나의 세션으로 합칩니다. 0 이면 즉시 반영.
+VOICE_GRACE_SECONDS = float(os.getenv("VOICE_GRACE_SECONDS", "20"))
+
+# 일정 시작 후 몇 초가 지나도 음성 채널에 없으면 알림을 보낼지
+SCHEDULE_START_GRACE_SECONDS = int(os.getenv("SCHEDULE_START_GRACE_SECONDS", "60"))
+
+# 무중단 재배포: 새 인스턴스가 기존 인스턴스의 상태를 넘겨받은 뒤 접속 (리스/인계 소켓은 HANDOFF_DIR 에 생성)
+HANDOFF_ENABLED = os.getenv("HANDOFF_ENABLED", "1").strip().lower() in {"1", "true", "yes"}
+HANDOFF_DIR = os.getenv("HANDOFF_DIR", "data")
+HANDOFF_TIMEOUT_SECONDS = float(os.getenv("HANDOFF_TIMEOUT_SECONDS", "30"))
+# 1 이면 인계를 요청하지 않고, 실행 중인 인스턴스가 멈출 때까지 대기만 함 (핫 스탠바이)
+BOT_STANDBY = os.getenv("BOT_STANDBY", "0").strip().lower() in {"1", "true", "yes"}
+
+# 주간 음성 리포트 + 누적 초기화 일정 (cron: 분 시 일 월 요일, 요일 0=일요일) 과 시간대
+WEEKLY_REPORT_CRON = os.getenv("WEEKLY_REPORT_CRON", "0 23 * * 0")
+REPORT_TIMEZONE = os.getenv("REPORT_TIMEZONE", "KST")
+
+# 로그: json(Datadog 용) / text(로컬 확인용), 로거별 레벨은 "notion=DEBUG,discord=WARNING" 형식
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").strip().lower()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# DEBUG 로그는 같은 메시지당 초당 LOG_DEBUG_RATE 개까지, 그중 LOG_DEBUG_SAMPLE 비율만 남김
+LOG_DEBUG_RATE = float(os.getenv("LOG_DEBUG_RATE", "5"))
+LOG_DEBUG_SAMPLE = float(os.getenv("LOG_DEBUG_SAMPLE", "1.0"))
+
+# 멤버 캐시 정책: full(시작 시 전체 청킹) / lazy(음성·최근 활동 멤버만 캐시, 나머지는 필요할 때 조회)
+MEMBER_CACHE_MODE = os.getenv("MEMBER_CACHE_MODE", "full").strip().lower()
+RECENT_MEMBER_CACHE_SIZE = int(os.getenv("RECENT_MEMBER_CACHE_SIZE", "500"))
+BOT_SHARDED = os.getenv("BOT_SHARDED", "0").strip().lower() in {"1", "true", "yes"}
+
 if not DISCORD_TOKEN:
     raise SystemExit("DISCORD_TOKEN 환경변수를 설정하세요 (.env 사용 가능).")
 if not VOICE_CHANNEL_ID or not REPORT_CHANNEL_ID_ENTER or not REPORT_CHANNEL_ID_TOEIC:
@@ -0,0 +1,196 @@
+# handoff.py
+# 무중단 재배포: 새 인스턴스가 기존 인스턴스의 실행 중 상태를 넘겨받은 뒤에야 디스코드에 접속합니다.
+# - 리스(lease): data/bot.lease 파일 잠금(flock). 잠금을 쥔 프로세스만 게이트웨이에 접속합니다.
+#   프로세스가 죽으면 커널이 잠금을 풀어 주므로, 대기 중인 인스턴스가 자동으로 이어받습니다.
+# - 인계 소켓: 리스를 쥔 인스턴스는 data/handoff.sock 에서 인계 요청을 기다립니다 (줄 단위 JSON).
+# 순서: 새 인스턴스 요청 -> 기존 인스턴스가 이벤트 처리를 멈추고 스냅샷 전송 -> 새 인스턴스 수신 확인(ack)
+#      -> 기존 인스턴스 종료(리스 해제) -> 새 인스턴스가 리스를 얻고 스냅샷 적용 후 접속
+# 스냅샷은 cog 별 export_state() / import_state(state) 훅으로 모읍니다.
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import socket
+from typing import Any, Dict, Optional
+
+from discord.ext import commands
+
+PROTOCOL_VERSION = 1
+MAX_SNAPSHOT_BYTES = 16 * 1024 * 1024
+
+log = logging.getLogger("handoff")
+
+
+def _encode(msg: Dict[str, Any]) -> bytes:
+    return (json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class Lease:
+    """한 번에 한 프로세스만 쥘 수 있는 파일 잠금."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        # redeploy.sh 가 새 컨테이너가 리스를 쥐었는지 확인할 때 호스트 이름(컨테이너 id)을 봅니다.
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()} {socket.gethostname()}\n".encode())
+        self._fd = fd
+        return True
+
+    async def acquire(self, poll_seconds: float = 0.5):
+        while not self.try_acquire():
+            await asyncio.sleep(poll_seconds)
+
+    def release(self):
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class HandoffCoordinator:
+    def __init__(self, bot: commands.Bot, data_dir: str = "data", timeout: float = 30.0):
+        self.bot = bot
+        self.timeout = timeout
+        os.makedirs(data_dir, exist_ok=True)
+        self.lease = Lease(os.path.join(data_dir, "bot.lease"))
+        self.socket_path = os.path.join(data_dir, "handoff.sock")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handing_off = False
+
+    # ===== 새 인스턴스 쪽 =====
+
+    async def take_over(self, standby: bool = False) -> Optional[Dict[str, Any]]:
+        """리스를 얻을 때까지 기다립니다. 기존 인스턴스에게서 받은 스냅샷이 있으면 돌려줍니다.
+        standby=True 면 인계를 요청하지 않고, 기존 인스턴스가 멈출 때까지 대기만 합니다."""
+        if self.lease.try_acquire():
+            return None
+
+        snapshot = None
+        if standby:
+            log.info("다른 인스턴스가 실행 중입니다. 대기 모드로 리스를 기다립니다.")
+        else:
+            snapshot = await self._request_snapshot()
+
+        if snapshot is not None:
+            try:
+                await asyncio.wait_for(self.lease.acquire(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                # 기존 인스턴스가 멈추지 않음 -> 받은 스냅샷은 낡았으므로 버리고 대기 모드로
+                log.warning("기존 인스턴스가 리스를 놓지 않아 스냅샷을 버리고 대기합니다.")
+                snapshot = None
+        await self.lease.acquire()
+        log.info("리스 획득")
+        return snapshot
+
+    async def _request_snapshot(self) -> Optional[Dict[str, Any]]:
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_SNAPSHOT_BYTES)
+        except OSError as e:
+            log.warning("기존 인스턴스에 연결 실패, 대기 모드로 전환: %s", e)
+            return None
+        try:
+            writer.write(_encode({"type": "handoff", "v": PROTOCOL_VERSION, "pid": os.getpid()}))
+            await writer.drain()
+            msg = json.loads(await asyncio.wait_for(reader.readline(), timeout=self.timeout) or b"{}")
+            if msg.get("type") != "snapshot" or msg.get("v") != PROTOCOL_VERSION:
+                log.warning("인계 거부됨, 대기 모드로 전환")
+                return None
+            writer.write(_encode({"type": "ack"}))
+            await writer.drain()
+            log.info("스냅샷 수신 완료")
+            return msg.get("state") or {}
+        except (asyncio.TimeoutError, ConnectionError, json.JSONDecodeError) as e:
+            log.warning("스냅샷 수신 실패, 대기 모드로 전환: %s", e)
+            return None
+        finally:
+            writer.close()
+
+    async def apply(self, state: Dict[str, Any]):
+        for name, cog_state in state.items():
+            cog = self.bot.get_cog(name)
+            importer = getattr(cog, "import_state", None)
+            if importer is None:
+                continue
+            try:
+                await importer(cog_state)
+            except Exception:
+                log.exception("%s 상태 적용 실패", name)
+
+    # ===== 기존 인스턴스 쪽 =====
+
+    async def collect(self) -> Dict[str, Any]:
+        """cog 별 상태를 모읍니다. 중간에 하나라도 실패하면 이미 멈춘 cog 들을 되살리고 예외를 다시 던집니다."""
+        state: Dict[str, Any] = {}
+        for name, cog in list(self.bot.cogs.items()):
+            exporter = getattr(cog, "export_state", None)
+            if exporter is None:
+                continue
+            try:
+                state[name] = await exporter()
+            except Exception:
+                log.exception("%s 상태 수집 실패, 수집한 cog 들을 재개합니다.", name)
+                await self.apply(state)
+                raise
+        return state
+
+    async def serve(self):
+        """리스를 쥔 뒤 호출합니다. 다음 배포의 인계 요청을 기다립니다."""
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        self._server = await asyncio.start_unix_server(self._on_request, path=self.socket_path, limit=MAX_SNAPSHOT_BYTES)
+
+    async def _on_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        state = None
+        try:
+            msg = json.loads(await reader.readline() or b"{}")
+            if msg.get("type") != "handoff" or msg.get("v") != PROTOCOL_VERSION or self._handing_off:
+                return
+            self._handing_off = True
+            log.info("인계 요청 수신 (pid=%s), 이벤트 처리를 멈춥니다.", msg.get("pid"))
+
+            state = await self.collect()
+            writer.write(_encode({"type": "snapshot", "v": PROTOCOL_VERSION, "state": state}))
+            await writer.drain()
+            ack = json.loads(await asyncio.wait_for(reader.readline(), timeout=self.timeout) or b"{}")
+            if ack.get("type") != "ack":
+                raise ConnectionError("수신 확인(ack) 없음")
+
+            log.info("인계 완료, 종료합니다.")
+            asyncio.create_task(self.bot.close())
+        except Exception as e:
+            log.warning("인계 실패, 계속 실행합니다: %s", e)
+            self._handing_off = False
+            if state is not None:
+                await self.apply(state)  # 멈췄던 cog 들을 원래 상태로 재개
+        finally:
+            writer.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        self.lease.release()
@@ -0,0 +1,243 @@
+# job_scheduler.py
+# 주기 작업 스케줄러 (주간 리포트/초기화 등)
+# - 일정은 cron 형식 "분 시 일 월 요일" + 시간대(time_utils.get_tz). 요일은 0(일)~6(토), 7 도 일요일.
+# - 모든 작업의 다음 실행 시각을 힙 하나에 넣고, 타이머 task 하나가 가장 가까운 시각까지 잠듭니다.
+# - 마지막 실행 시각은 data/jobs.json 에 저장합니다. 봇이 꺼져 있던 사이 지나간 실행은
+#   다시 등록될 때 한 번으로 합쳐서 바로 실행합니다 (catch-up).
+import asyncio
+import datetime as dt
+import heapq
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from time_utils import get_tz, iso, parse_iso
+
+log = logging.getLogger("scheduler")
+
+JobCallback = Callable[[dt.datetime], Awaitable[None]]
+
+# 시스템 시계가 바뀌거나(절전 등) 오래 잠들어도 어긋나지 않도록, 최대 이만큼만 자고 다시 확인합니다.
+MAX_SLEEP_SECONDS = 300
+
+# (최소, 최대) : 분, 시, 일, 월, 요일
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(spec: str, lo: int, hi: int) -> List[int]:
+    values: Set[int] = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(part)
+            end = hi if step > 1 else start
+        if step < 1 or start < lo or end > hi or start > end:
+            raise ValueError(f"cron 필드 범위 오류: {spec}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+class CronSchedule:
+    def __init__(self, expr: str, tz: Optional[str] = None):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 식은 5개 필드여야 합니다: {expr!r}")
+        self.expr = expr
+        self.tz_name = tz
+        self.tz = get_tz(tz)
+        parsed = [_parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, _FIELD_RANGES)]
+        self.minutes, self.hours = parsed[0], parsed[1]
+        self.days, self.months = set(parsed[2]), set(parsed[3])
+        self.weekdays = {d % 7 for d in parsed[4]}
+        # cron 규칙: 일/요일이 둘 다 지정되면 둘 중 하나만 맞아도 실행.
+        # "*/2" 처럼 * 로 시작하는 필드는 지정되지 않은 것으로 봅니다 (이때는 둘 다 맞아야 함).
+        self._any_day = fields[2].startswith("*")
+        self._any_weekday = fields[4].startswith("*")
+
+    def _day_matches(self, day: dt.date) -> bool:
+        if day.month not in self.months:
+            return False
+        dom = day.day in self.days
+        dow = day.isoweekday() % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, after: dt.datetime) -> dt.datetime:
+        """after 보다 뒤의 첫 실행 시각 (일정의 시간대 기준)."""
+        local = after.astimezone(self.tz)
+        day = local.date()
+        for _ in range(366 * 8):  # 2월 29일 같은 드문 조합까지
+            if self._day_matches(day):
+                for h in self.hours:
+                    for m in self.minutes:
+                        candidate = dt.datetime.combine(day, dt.time(h, m), tzinfo=self.tz)
+                        if candidate > local:
+                            return candidate
+            day += dt.timedelta(days=1)
+        raise ValueError(f"다음 실행 시각을 찾을 수 없습니다: {self.expr!r}")
+
+
+class Job:
+    def __init__(self, key: str, schedule: CronSchedule, callback: JobCallback, guild_id: Optional[int]):
+        self.key = key
+        self.schedule = schedule
+        self.callback = callback
+        self.guild_id = guild_id
+        self.next_run: Optional[dt.datetime] = None
+        self.last_run: Optional[dt.datetime] = None
+
+
+class JobScheduler:
+    def __init__(self, path: str = "data/jobs.json"):
+        self.path = path
+        self._jobs: Dict[str, Job] = {}
+        # (다음 실행 시각, 순번, 작업 키). 제거/재등록된 항목은 꺼낼 때 next_run 과 비교해 버립니다.
+        self._heap: List[Tuple[dt.datetime, int, str]] = []
+        self._seq = 0
+        self._saved: Optional[Dict[str, Dict[str, Any]]] = None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    # ===== 저장 =====
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        # 무중단 재배포 때 리스를 얻기 전에 읽지 않도록, 처음 필요할 때 읽습니다.
+        if self._saved is None:
+            self._saved = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._saved = json.load(f).get("jobs", {})
+                except Exception as e:
+                    log.warning("%s 로드 중 오류: %s", self.path, e)
+        return self._saved
+
+    def _save(self):
+        saved = self._load()
+        for key, job in self._jobs.items():
+            entry = saved.setdefault(key, {})
+            entry.update({"cron": job.schedule.expr, "tz": job.schedule.tz_name, "guild_id": job.guild_id})
+            if job.last_run:
+                entry["last_run"] = iso(job.last_run)
+        tmp = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "jobs": saved}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            log.warning("%s 저장 중 오류: %s", self.path, e)
+
+    # ===== 등록 =====
+
+    def add_job(self, name: str, cron: str, callback: JobCallback, tz: Optional[str] = None,
+                guild_id: Optional[int] = None, catch_up: bool = True) -> Job:
+        """작업을 등록합니다. 저장된 마지막 실행 이후 놓친 실행이 있으면 바로 실행되도록 잡습니다."""
+        key = name if guild_id is None else f"{name}:{guild_id}"
+        schedule = CronSchedule(cron, tz)
+        job = Job(key, schedule, callback, guild_id)
+
+        saved = self._load().get(key, {})
+        now = dt.datetime.now(schedule.tz)
+        job.last_run = parse_iso(saved["last_run"]) if saved.get("last_run") else None
+        # 처음 등록된 작업은 등록 시각부터 놓친 실행을 셉니다.
+        baseline = job.last_run or (parse_iso(saved["since"]) if saved.get("since") else None)
+        if baseline is None:
+            self._load()[key] = {"since": iso(now)}
+
+        job.next_run = schedule.next_after(now)
+        if catch_up and baseline is not None:
+            missed = schedule.next_after(baseline)
+            if missed <= now:
+                # 여러 번 놓쳤으면 가장 최근 회차 한 번만 실행
+                count = 1
+                while job.next_run > (nxt := schedule.next_after(missed)):
+                    missed = nxt
+                    count += 1
+                log.info("%s: 놓친 실행 %d회 -> %s 회차를 지금 실행합니다.", key, count, missed.isoformat())
+                job.next_run = missed
+
+        self._jobs[key] = job
+        self._push(job)
+        self._save()
+        return job
+
+    def remove_job(self, name: str, guild_id: Optional[int] = None):
+        key = name if guild_id is None else f"{name}:{guild_id}"
+        if self._jobs.pop(key, None):
+            self._wake.set()
+
+    def get_job(self, name: str, guild_id: Optional[int] = None) -> Optional[Job]:
+        return self._jobs.get(name if guild_id is None else f"{name}:{guild_id}")
+
+    def _push(self, job: Job):
+        self._seq += 1
+        heapq.heappush(self._heap, (job.next_run, self._seq, job.key))
+        self._wake.set()
+
+    # ===== 실행 =====
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            # 제거됐거나 다시 잡힌 작업의 옛 항목은 버림
+            while self._heap:
+                due, _, key = self._heap[0]
+                job = self._jobs.get(key)
+                if job is not None and job.next_run == due:
+                    break
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                await self._wake.wait()
+                continue
+
+            due, _, key = self._heap[0]
+            delay = (due - dt.datetime.now(dt.timezone.utc)).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=min(delay, MAX_SLEEP_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            self._fire(self._jobs[key], due)
+
+    def _fire(self, job: Job, due: dt.datetime):
+        # 실행 전에 기록합니다 (실행 도중 죽어도 같은 회차를 두 번 보내지 않도록).
+        job.last_run = due
+        job.next_run = job.schedule.next_after(max(due, dt.datetime.now(job.schedule.tz)))
+        self._push(job)
+        self._save()
+
+        task = asyncio.create_task(self._invoke(job, due))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _invoke(self, job: Job, due: dt.datetime):
+        try:
+            await job.callback(due)
+            log.info("%s 실행 완료 (예정 %s)", job.key, due.isoformat(), extra={"event": "job"})
+        except Exception:
+            log.exception("%s 실행 실패", job.key, extra={"event": "job"})
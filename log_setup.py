@@ -0,0 +1,145 @@
+# log_setup.py
+# 구조화 로그 설정 (JSON 한 줄씩, Datadog 이 그대로 파싱)
+# 이벤트 루프 쪽에서는 레코드를 큐에 넣기만 하고, 직렬화와 stdout 쓰기는 QueueListener 의 백그라운드 스레드가 합니다.
+# - 로거별 레벨: LOG_LEVEL(기본), LOG_LEVELS="notion=DEBUG,discord=WARNING"
+# - DEBUG 레코드는 (로거, 메시지) 별 초당 LOG_DEBUG_RATE 개까지, LOG_DEBUG_SAMPLE 비율만 남깁니다.
+# - 메시지는 logger.info("... %s", x) 처럼 % 인자로 넘겨야, 레벨이 꺼져 있을 때 문자열을 만들지 않습니다.
+# - extra={"cog", "guild", "event", "latency_ms"} 등은 JSON 필드로 그대로 나갑니다.
+import atexit
+import copy
+import datetime as dt
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+
+from config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_DEBUG_RATE, LOG_DEBUG_SAMPLE
+
+# LogRecord 기본 속성 (이 외의 속성은 extra 로 들어온 필드)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": dt.datetime.fromtimestamp(record.created, dt.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                data[key] = value
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """DEBUG 레코드를 (로거, 메시지 템플릿) 별 토큰 버킷과 샘플링으로 솎아 냅니다.
+    버려진 개수는 다음에 통과하는 같은 종류의 레코드에 dropped 필드로 붙습니다."""
+
+    def __init__(self, rate_per_second: float, sample: float):
+        super().__init__()
+        self.rate = rate_per_second
+        self.sample = sample
+        # (로거, 메시지 템플릿) -> [남은 토큰, 마지막 갱신 시각, 버린 개수]
+        self._buckets: Dict[tuple, List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.rate, now, 0]
+        if self.sample < 1.0 and random.random() >= self.sample:
+            bucket[2] += 1
+            return False
+        if self.rate > 0:
+            bucket[0] = min(self.rate, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1.0
+        if bucket[2]:
+            record.dropped = int(bucket[2])
+            bucket[2] = 0
+        return True
+
+
+class _LoopSafeQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 인자 병합만 호출한 쪽에서 하고 (인자 객체가 나중에 바뀌어도 안전하도록), 나머지는 리스너 스레드에서
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class ContextLogger(logging.LoggerAdapter):
+    """고정 필드(cog 등)를 붙이는 어댑터. 호출할 때 넘긴 extra 와 합쳐집니다."""
+
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {**self.extra, **(kwargs.get("extra") or {})}
+        return msg, kwargs
+
+
+def get_logger(name: str, **context) -> logging.LoggerAdapter:
+    return ContextLogger(logging.getLogger(name), context)
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for part in spec.split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(service: str = "bot"):
+    """프로세스 시작 시 한 번 호출합니다."""
+    global _listener
+    if _listener is not None:
+        return
+
+    out = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "text":
+        out.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    else:
+        out.setFormatter(JsonFormatter())
+
+    handler = _LoopSafeQueueHandler(queue.SimpleQueue())
+    handler.addFilter(DebugSampler(LOG_DEBUG_RATE, LOG_DEBUG_SAMPLE))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(LOG_LEVEL)
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    # 모든 레코드에 서비스 이름을 붙입니다 (봇 / 노션 워커 구분)
+    factory = logging.getLogRecordFactory()
+
+    def record_factory(*args, **kwargs):
+        record = factory(*args, **kwargs)
+        record.service = service
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+
+    _listener = QueueListener(handler.queue, out, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -1,19 +1,63 @@
 # main.py
 import asyncio
+import logging
+import sys
+from pathlib import Path
 
-from config import DISCORD_TOKEN
+from config import (
+    DISCORD_TOKEN,
+    NOTION_MODE,
+    NOTION_WORKER_SPAWN,
+    HANDOFF_ENABLED,
+    HANDOFF_DIR,
+    HANDOFF_TIMEOUT_SECONDS,
+    BOT_STANDBY,
+)
 from bot import bot  # 위에서 만든 bot 인스턴스를 가져옵니다.
+from handoff import HandoffCoordinator
+from log_setup import setup_logging
+
+log = logging.getLogger("bot")
+
+async def start_notion_worker():
+    # NOTION_MODE=ipc + NOTION_WORKER_SPAWN=1 이면 노션 워커를 자식 프로세스로 띄웁니다.
+    if NOTION_MODE != "ipc" or not NOTION_WORKER_SPAWN:
+        return None
+    worker_path = Path(__file__).resolve().parent / "notion_worker.py"
+    proc = await asyncio.create_subprocess_exec(sys.executable, str(worker_path))
+    log.info("노션 워커 프로세스 시작 (pid=%s)", proc.pid)
+    return proc
 
 async def main():
     async with bot:
+        # 무중단 재배포: 기존 인스턴스가 있으면 상태를 넘겨받고 리스를 얻을 때까지 대기
+        handoff = HandoffCoordinator(bot, HANDOFF_DIR, HANDOFF_TIMEOUT_SECONDS) if HANDOFF_ENABLED else None
+        snapshot = await handoff.take_over(standby=BOT_STANDBY) if handoff else None
+
         # cogs 폴더에 있는 확장들을 여기서 로드합니다.
         await bot.load_extension("cogs.voice_time")
         await bot.load_extension("cogs.mention_shortcut")
         await bot.load_extension("cogs.menu_commands")
         await bot.load_extension("cogs.notion_watcher")
+        await bot.load_extension("cogs.admin")
+
+        if handoff:
+            if snapshot:
+                await handoff.apply(snapshot)
+            await handoff.serve()
+
+        worker = await start_notion_worker()
 
         # 실제 디스코드 봇 실행
-        await bot.start(DISCORD_TOKEN)
+        try:
+            await bot.start(DISCORD_TOKEN)
+        finally:
+            if worker and worker.returncode is None:
+                worker.terminate()
+                await worker.wait()
+            if handoff:
+                await handoff.close()
 
 if __name__ == "__main__":
+    setup_logging("bot")
     asyncio.run(main())
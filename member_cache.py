@@ -0,0 +1,86 @@
+# member_cache.py
+# 대형 길드용 멤버 조회 정책
+# - full: 기존처럼 시작 시 전체 멤버를 청킹하고 guild.members 를 그대로 사용
+# - lazy: 음성 채널 멤버/최근 활동 멤버만 캐시하고, 나머지는 필요할 때
+#         query_members 로 찾거나 길드 단위로 한 번만 청킹
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+log = logging.getLogger("members")
+
+
+class MemberResolver:
+    def __init__(self, lazy: bool = False, recent_size: int = 500, query_limit: int = 100):
+        self.lazy = lazy
+        self.recent_size = recent_size
+        self.query_limit = query_limit
+        # guild_id -> (member_id -> Member), 최근에 활동한 순서대로 유지 (LRU)
+        self._recent: Dict[int, "OrderedDict[int, discord.Member]"] = {}
+        self._chunk_locks: Dict[int, asyncio.Lock] = {}
+
+    def remember(self, member: discord.Member):
+        """메시지/음성 이벤트로 활동이 확인된 멤버를 최근 캐시에 넣습니다."""
+        if not self.lazy or not isinstance(member, discord.Member):
+            return
+        recent = self._recent.setdefault(member.guild.id, OrderedDict())
+        recent[member.id] = member
+        recent.move_to_end(member.id)
+        while len(recent) > self.recent_size:
+            recent.popitem(last=False)
+
+    def get_member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        found = guild.get_member(user_id)
+        if found or not self.lazy:
+            return found
+        return self._recent.get(guild.id, {}).get(user_id)
+
+    def _needs_chunk(self, guild: discord.Guild) -> bool:
+        return self.lazy and not guild.chunked
+
+    async def all_members(self, guild: discord.Guild) -> List[discord.Member]:
+        """전체 멤버 목록이 꼭 필요할 때만 호출합니다. lazy 모드에서는 길드당 처음 한 번 청킹합니다."""
+        if self._needs_chunk(guild):
+            lock = self._chunk_locks.setdefault(guild.id, asyncio.Lock())
+            async with lock:
+                if not guild.chunked:
+                    try:
+                        await guild.chunk(cache=True)
+                        log.info("%s 청킹 완료 (%s명)", guild.name, guild.member_count, extra={"guild": guild.id})
+                    except Exception as e:
+                        log.warning("%s 청킹 실패: %s", guild.name, e, extra={"guild": guild.id})
+        return list(guild.members)
+
+    async def candidates(self, guild: discord.Guild, query: str) -> List[discord.Member]:
+        """이름 검색 대상 멤버 목록. lazy 모드에서는 캐시 + query_members 결과만 돌려줍니다."""
+        if not self._needs_chunk(guild):
+            return list(guild.members)
+
+        pool: Dict[int, discord.Member] = {m.id: m for m in guild.members}
+        pool.update(self._recent.get(guild.id, {}))
+        if query:
+            try:
+                found = await guild.query_members(query=query, limit=self.query_limit, cache=True)
+                for m in found:
+                    pool[m.id] = m
+            except Exception as e:
+                log.warning("query_members 실패 (%s): %s", query, e, extra={"guild": guild.id})
+        return list(pool.values())
+
+    async def find_members(
+        self,
+        guild: discord.Guild,
+        predicate: Callable[[discord.Member], bool],
+        query: str = "",
+    ) -> List[discord.Member]:
+        """봇을 제외하고 predicate 를 만족하는 멤버를 찾습니다.
+        lazy 모드에서 후보 중에 없으면 그때 길드를 청킹해서 다시 찾습니다."""
+        members = await self.candidates(guild, query)
+        hits = [m for m in members if not m.bot and predicate(m)]
+        if hits or not self._needs_chunk(guild):
+            return hits
+        members = await self.all_members(guild)
+        return [m for m in members if not m.bot and predicate(m)]
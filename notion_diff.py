@@ -0,0 +1,151 @@
+# notion_diff.py
+# 노션 행(row) 단위 지문(fingerprint) 기반 변경 감지
+# DB 마다 행 id -> (행 해시, 필드별 짧은 해시, 상태값) 만 기억하고,
+# 새로 조회한 행과 비교해 created / updated / deleted / status_changed 이벤트를 만듭니다.
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+CHANGE_CREATED = "created"                # {kind, id, item}
+CHANGE_UPDATED = "updated"                # {kind, id, item, fields: {필드: 새 값}}
+CHANGE_DELETED = "deleted"                # {kind, id}
+CHANGE_STATUS = "status_changed"          # {kind, id, item, old: [..], new: [..]}
+
+# 편집할 때마다 바뀌는 메타 속성은 내용 비교에서 제외합니다.
+_IGNORED_PROP_TYPES = {"last_edited_time", "last_edited_by", "created_time", "created_by"}
+
+# 전체 목록을 못 받은 경우(페이지 잘림) 추적 행 수 상한
+MAX_TRACKED_ROWS = 1000
+
+
+def _digest(raw: str, size: int) -> str:
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=size).hexdigest()
+
+
+def prop_value(prop: Dict[str, Any]) -> str:
+    """노션 속성 하나를 비교/표시용 문자열로 평탄화합니다."""
+    t = prop.get("type")
+    v = prop.get(t)
+    if v is None:
+        return ""
+    if t in ("title", "rich_text"):
+        return "".join(x.get("plain_text", "") for x in v).strip()
+    if t in ("select", "status"):
+        return v.get("name") or ""
+    if t == "multi_select":
+        return ",".join(o.get("name", "") for o in v)
+    if t == "date":
+        start, end = v.get("start") or "", v.get("end") or ""
+        return f"{start}~{end}" if end else start
+    if t in ("people", "relation"):
+        return ",".join(x.get("id", "") for x in v)
+    if isinstance(v, (str, int, float, bool)):
+        return str(v)
+    return json.dumps(v, sort_keys=True, ensure_ascii=False)
+
+
+def row_fields(row: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        name: prop_value(prop)
+        for name, prop in row.get("properties", {}).items()
+        if isinstance(prop, dict) and prop.get("type") not in _IGNORED_PROP_TYPES
+    }
+
+
+class RowDiffer:
+    """DB 하나의 행 지문 저장소.
+
+    state 형식 (JSON 저장용): {row_id: {"h": 행 해시, "f": {필드: 필드 해시}, "s": 상태값}}
+    행 해시가 그대로면 필드 비교 없이 O(1) 로 건너뜁니다.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        item_builder: Callable[[Dict[str, Any]], Dict[str, Any]],
+        status_of: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+    ):
+        self.kind = kind
+        self.item_builder = item_builder
+        self.status_of = status_of
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        # 한 번이라도 기준값을 잡았는지. 행이 전부 지워진 DB 와 처음 보는 DB 를 구분하기 위해 따로 둡니다.
+        self.initialized = False
+        # 예전 형식에서 넘어온 뒤 아직 한 번도 비교하지 않음
+        self.migrating = False
+
+    def knows(self, row_id: str) -> bool:
+        return row_id in self.rows
+
+    def seed(self, row_ids, statuses: Optional[Dict[str, str]] = None):
+        """예전 저장 형식(id 목록)에서 넘어올 때: 해시는 비워 두고 다음 조회 때 조용히 기준값을 잡습니다.
+        예전 형식은 최근 수정된 일부 id 만 담고 있으므로, 다음 비교에서는 모르는 행도 새 글로 보지 않고
+        이미 알던 행의 상태 전환만 확인합니다."""
+        statuses = statuses or {}
+        for rid in row_ids:
+            self.rows.setdefault(rid, {"h": "", "f": {}, "s": statuses.get(rid)})
+        self.initialized = True
+        self.migrating = True
+
+    def diff(self, rows: List[Dict[str, Any]], complete: bool) -> List[Dict[str, Any]]:
+        changes: List[Dict[str, Any]] = []
+        seen = set()
+        # 첫 실행이면 기존 행을 전부 새 글로 알리지 않고 기준값만 잡습니다.
+        baseline = not self.initialized
+        migrating = self.migrating
+        for row in rows:
+            rid = row["id"]
+            seen.add(rid)
+            fields = row_fields(row)
+            row_hash = _digest(json.dumps(fields, sort_keys=True, ensure_ascii=False), 8)
+            prev = self.rows.get(rid)
+            if prev is not None and prev["h"] == row_hash:
+                continue
+
+            field_hashes = {k: _digest(v, 4) for k, v in fields.items()}
+            status = ",".join(self.status_of(row)) if self.status_of else None
+            self.rows[rid] = {"h": row_hash, "f": field_hashes, "s": status}
+
+            if baseline:
+                continue
+            if prev is None:
+                if migrating:
+                    continue
+                changes.append({"kind": CHANGE_CREATED, "id": rid, "item": self.item_builder(row)})
+                continue
+            if not prev["h"]:
+                # 이전 형식에서 넘어온 행: 기준값만 잡고, 상태 전환만 확인
+                if prev.get("s") is not None and status is not None and prev["s"] != status:
+                    changes.append(self._status_change(row, prev["s"], status))
+                continue
+
+            changed_fields = {
+                k: fields.get(k, "")
+                for k in set(field_hashes) | set(prev["f"])
+                if field_hashes.get(k) != prev["f"].get(k)
+            }
+            if changed_fields:
+                changes.append({"kind": CHANGE_UPDATED, "id": rid, "item": self.item_builder(row), "fields": changed_fields})
+            if self.status_of and prev.get("s") is not None and status is not None and prev["s"] != status:
+                changes.append(self._status_change(row, prev["s"], status))
+
+        if complete:
+            for rid in [r for r in self.rows if r not in seen]:
+                del self.rows[rid]
+                if not migrating:
+                    changes.append({"kind": CHANGE_DELETED, "id": rid})
+        elif len(self.rows) > MAX_TRACKED_ROWS:
+            for rid in [r for r in self.rows if r not in seen][: len(self.rows) - MAX_TRACKED_ROWS]:
+                del self.rows[rid]
+        self.initialized = True
+        self.migrating = False
+        return changes
+
+    def _status_change(self, row: Dict[str, Any], old: str, new: str) -> Dict[str, Any]:
+        return {
+            "kind": CHANGE_STATUS,
+            "id": row["id"],
+            "item": self.item_builder(row),
+            "old": [s for s in old.split(",") if s],
+            "new": [s for s in new.split(",") if s],
+        }
@@ -0,0 +1,169 @@
+# notion_ipc.py
+# 노션 워커 프로세스 <-> 봇 사이의 로컬 통신 (TCP, 줄 단위 JSON)
+# 워커가 접속하면 먼저 {"type": "hello", "token": ...} 을 보내고, 이후 이벤트를 한 줄씩 보냅니다.
+# 루프백이 아닌 주소(0.0.0.0 등)로 열 때는 토큰이 반드시 있어야 합니다.
+import asyncio
+import hmac
+import ipaddress
+import json
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+PROTOCOL_VERSION = 1
+MAX_LINE_BYTES = 4 * 1024 * 1024
+
+log = logging.getLogger("notion.ipc")
+
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _encode(msg: Dict[str, Any]) -> bytes:
+    return (json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _token_ok(expected: str, given: Any) -> bool:
+    if not expected:
+        return True
+    return isinstance(given, str) and hmac.compare_digest(given.encode("utf-8"), expected.encode("utf-8"))
+
+
+class EventServer:
+    """수신 서버와 연결된 워커 목록.
+    close() 는 열린 연결까지 끊어서, cog 를 다시 불러온 뒤 워커가 새 handler 로 재접속하게 합니다."""
+
+    def __init__(self):
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.clients: Set[asyncio.StreamWriter] = set()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        for writer in list(self.clients):
+            writer.close()
+        if self.server is not None:
+            await self.server.wait_closed()
+
+
+async def start_event_server(handler: EventHandler, host: str, port: int, token: str = "") -> EventServer:
+    """봇 쪽: 워커가 보내는 이벤트를 받아 handler 로 넘깁니다."""
+    if not token and not _is_loopback(host):
+        raise ValueError(f"NOTION_IPC_TOKEN 없이 루프백이 아닌 주소({host})로는 열 수 없습니다.")
+    event_server = EventServer()
+
+    async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        event_server.clients.add(writer)
+        try:
+            try:
+                hello = json.loads(await reader.readline() or b"{}")
+            except ValueError:  # JSON 이 아니거나 MAX_LINE_BYTES 초과
+                hello = None
+            if (
+                not isinstance(hello, dict)
+                or hello.get("type") != "hello"
+                or hello.get("v") != PROTOCOL_VERSION
+                or not _token_ok(token, hello.get("token"))
+            ):
+                log.warning("잘못된 접속 거부: %s", peer)
+                return
+            log.info("워커 연결됨: %s", peer)
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # 한 줄이 MAX_LINE_BYTES 를 넘으면 스트림 위치를 믿을 수 없으므로 연결을 끊습니다 (워커가 재접속).
+                    log.warning("너무 긴 메시지, 연결을 끊습니다: %s", peer)
+                    break
+                if not line:
+                    break
+                try:
+                    event = json.loads(line)
+                except ValueError as e:
+                    log.warning("잘못된 메시지: %s", e)
+                    continue
+                if not isinstance(event, dict):
+                    log.warning("잘못된 메시지: 객체가 아님 (%s)", type(event).__name__)
+                    continue
+                try:
+                    await handler(event)
+                except Exception:
+                    log.exception("이벤트 처리 오류 (%s)", event.get("type"), extra={"event": event.get("type")})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            log.info("워커 연결 종료: %s", peer)
+            event_server.clients.discard(writer)
+            writer.close()
+
+    event_server.server = await asyncio.start_server(on_client, host, port, limit=MAX_LINE_BYTES)
+    return event_server
+
+
+class EventPublisher:
+    """워커 쪽: 봇에 이벤트를 보냅니다. 봇이 재시작 중이면 버퍼에 모아 두었다가 재연결 후 보냅니다."""
+
+    def __init__(self, host: str, port: int, token: str = "", buffer_size: int = 1000):
+        self.host = host
+        self.port = port
+        self.token = token
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        # 종류별 마지막 값만 의미 있는 이벤트(예: 활성 일정)는 재연결할 때마다 다시 보냅니다.
+        self._sticky: Dict[str, Dict[str, Any]] = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self) -> bool:
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            writer.write(_encode({"type": "hello", "v": PROTOCOL_VERSION, "token": self.token}))
+            buffered_types = {e.get("type") for e in self._buffer}
+            for kind, event in self._sticky.items():
+                if kind not in buffered_types:
+                    writer.write(_encode(event))
+            await writer.drain()
+            self._reader, self._writer = reader, writer
+            log.info("봇에 연결됨 (%s:%s)", self.host, self.port)
+            return True
+        except OSError as e:
+            log.warning("봇 연결 실패 (%s:%s): %s", self.host, self.port, e)
+            return False
+
+    async def publish(self, event: Dict[str, Any], sticky: bool = False):
+        if sticky:
+            self._sticky[event["type"]] = event
+        self._buffer.append(event)
+        await self.flush()
+
+    async def flush(self):
+        # 봇이 재시작하며 연결을 끊었으면 다시 접속해서 sticky 이벤트부터 보냅니다.
+        if self._writer is not None and self._reader.at_eof():
+            self._writer.close()
+            self._writer = None
+        if not self._buffer and (self._writer is not None or not self._sticky):
+            return
+        if self._writer is None and not await self._connect():
+            return
+        try:
+            while self._buffer:
+                self._writer.write(_encode(self._buffer[0]))
+                await self._writer.drain()
+                self._buffer.popleft()
+        except (ConnectionError, OSError) as e:
+            log.warning("전송 실패, 재연결 대기: %s", e)
+            self._writer.close()
+            self._writer = None
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,447 @@
+# notion_sync.py
+# 노션 DB 폴링/파싱/변경 감지 엔진 (디스코드 의존성 없음)
+# 봇 프로세스 안에서 돌릴 수도 있고(notion_watcher cog), 별도 프로세스(notion_worker.py)로 돌릴 수도 있습니다.
+# 감지 결과는 JSON 으로 직렬화 가능한 이벤트(dict) 목록으로 돌려주고, 메시지 렌더링/전송은 봇 쪽에서 합니다.
+import asyncio
+import datetime as dt
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from config import (
+    NOTION_TOKEN,
+    NOTION_DATABASE_FEATURE_ID,
+    NOTION_DATABASE_BOARD_ID,
+    NOTION_DATABASE_SCHEDULE_ID,
+    NOTION_POLL_MIN_SECONDS,
+    NOTION_POLL_MAX_SECONDS,
+    NOTION_SCHEDULE_LEAD_SECONDS,
+)
+from notion_diff import RowDiffer
+from time_utils import KST, now_kst
+
+log = logging.getLogger("notion")
+
+# ===== 이벤트 종류 =====
+EVENT_ROW_CHANGES = "row_changes"              # db, changes: [notion_diff 의 변경 항목]
+EVENT_ACTIVE_SCHEDULES = "active_schedules"    # entries: [{id, name, start, end}]
+
+# [설정] 노션 이름 -> 디스코드 닉네임 변환 사전
+NAME_MAPPING = {
+    "임아리": "이유",
+    "김성아": "SAK",
+    "장민지": "민둥"
+}
+
+NOTION_API = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+# 새 행이 생기면 작성자가 내용을 채울 시간을 주고 다시 조회합니다.
+SETTLE_SECONDS = 20
+
+# 한 번 조회할 때 따라갈 최대 페이지 수 (끝까지 받은 경우에만 삭제를 감지합니다)
+PAGE_SIZE = 100
+MAX_PAGES = 3
+
+
+# DB 별 폴링 스케줄 이름
+DB_FEATURE = "feature"
+DB_BOARD = "board"
+DB_SCHEDULE = "schedule"
+
+
+def make_event(kind: str, **fields) -> Dict[str, Any]:
+    return {"type": kind, **fields}
+
+
+# ===== 헬퍼 함수들 =====
+
+def _is_completed_status(name: str) -> bool:
+    n = (name or "").strip().lower()
+    if not n:
+        return False
+    return ("완료" in n) or (n in {"done", "completed", "complete"})
+
+def _any_completed(status_names: List[str]) -> bool:
+    return any(_is_completed_status(n) for n in status_names)
+
+def _trim_to_minute(iso_str: str) -> str:
+    if not iso_str:
+        return ""
+    if "T" in iso_str:
+        date_part, time_part = iso_str.split("T", 1)
+        hhmm = time_part[:5]
+        return f"{date_part} {hhmm}"
+    return iso_str
+
+def _clean_env(val: Optional[str]) -> str:
+    return str(val).strip() if val else ""
+
+def _row_status(row: Dict[str, Any]) -> List[str]:
+    return _status_names(row.get("properties", {}))
+
+def _find_prop(props: Dict[str, Any], name: str, types: tuple) -> Optional[Dict[str, Any]]:
+    prop = props.get(name)
+    if prop:
+        return prop
+    for v in props.values():
+        if isinstance(v, dict) and v.get("type") in types:
+            return v
+    return None
+
+def _status_names(props: Dict[str, Any]) -> List[str]:
+    names: List[str] = []
+    st = _find_prop(props, "상태", ("status", "select", "multi_select"))
+    if not st:
+        return names
+    t = st.get("type")
+    if t == "status":
+        n = (st.get("status") or {}).get("name")
+        if n: names.append(n)
+    elif t == "select":
+        n = (st.get("select") or {}).get("name")
+        if n: names.append(n)
+    elif t == "multi_select":
+        names.extend(o["name"] for o in st.get("multi_select", []) if o.get("name"))
+    return names
+
+def _plain_text(prop: Optional[Dict[str, Any]], kinds: tuple = ("title", "rich_text")) -> str:
+    if not prop or prop.get("type") not in kinds:
+        return ""
+    return "".join(x.get("plain_text", "") for x in prop.get(prop["type"], [])).strip()
+
+def _feature_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    props = row.get("properties", {})
+    status_names = _status_names(props)
+    return {
+        "id": row["id"],
+        "title": _plain_text(props.get("내용")) or "(내용 없음)",
+        "description": _plain_text(props.get("설명") or props.get("Description"), ("rich_text",)) or "(설명 없음)",
+        "completed": _any_completed(status_names),
+    }
+
+def _schedule_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    props = row.get("properties", {})
+    start = end = None
+    dp = _find_prop(props, "날짜", ("date",))
+    if dp and dp.get("type") == "date":
+        d = dp.get("date") or {}
+        start, end = d.get("start"), d.get("end")
+    tags: List[str] = []
+    tp = _find_prop(props, "태그", ("multi_select",))
+    if tp and tp.get("type") == "multi_select":
+        tags = [o["name"] for o in tp.get("multi_select", []) if o.get("name")]
+    # 매핑 테이블 적용 (A -> 이유)
+    names = [NAME_MAPPING.get(t, t) for t in tags]
+    return {"id": row["id"], "tags": tags, "names": names, "start": start, "end": end}
+
+def _parse_notion_dt(s: Optional[str]) -> Optional[dt.datetime]:
+    if not s:
+        return None
+    try:
+        value = dt.datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=KST)
+    return value
+
+
+class PollSchedule:
+    """DB 하나의 적응형 폴링 간격.
+    변경이 감지되면 최소 간격으로 당기고, 변화가 없으면 최대 간격까지 두 배씩 늘립니다."""
+
+    def __init__(self, name: str, min_seconds: float, max_seconds: float):
+        self.name = name
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.interval = min_seconds
+        self.next_due = 0.0  # time.monotonic() 기준, 0 이면 즉시 조회
+
+    def is_due(self, now: float) -> bool:
+        return now >= self.next_due
+
+    def record(self, changed: bool, now: float):
+        prev = self.interval
+        if changed:
+            self.interval = self.min_seconds
+        else:
+            self.interval = min(self.max_seconds, self.interval * 2)
+        self.next_due = now + self.interval
+        if self.interval != prev:
+            log.debug("%s 폴링 간격 %.0fs -> %.0fs", self.name, prev, self.interval)
+
+    def pull_in(self, due: float):
+        self.next_due = min(self.next_due, due)
+
+
+class NotionSyncEngine:
+    def __init__(self, db_file: str = "data/notion_db.json"):
+        self.db_file = db_file
+
+        # DB 별 (노션 DB id, 행 지문 저장소)
+        self.databases: Dict[str, tuple] = {}
+        for name, db_id, differ in (
+            (DB_FEATURE, NOTION_DATABASE_FEATURE_ID, RowDiffer(DB_FEATURE, _feature_item, _row_status)),
+            (DB_BOARD, NOTION_DATABASE_BOARD_ID, RowDiffer(DB_BOARD, lambda row: {"id": row["id"]})),
+            (DB_SCHEDULE, NOTION_DATABASE_SCHEDULE_ID, RowDiffer(DB_SCHEDULE, _schedule_item)),
+        ):
+            if db_id:
+                self.databases[name] = (db_id, differ)
+
+        self.polls: Dict[str, PollSchedule] = {
+            name: PollSchedule(name, NOTION_POLL_MIN_SECONDS, NOTION_POLL_MAX_SECONDS)
+            for name in self.databases
+        }
+        # 활성 일정은 일정 DB 에 변경이 있거나, 오래됐거나, 일정 경계가 임박했을 때만 다시 조회합니다.
+        self._active_fetched_at: Optional[float] = None
+        # 다가오는 일정 시작/종료 시각 (정렬됨). 이 시각 직전에 일정 DB 를 미리 조회합니다.
+        self._schedule_boundaries: List[dt.datetime] = []
+
+        self.load_state()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(NOTION_TOKEN and NOTION_DATABASE_FEATURE_ID)
+
+    def load_state(self):
+        if not os.path.exists(self.db_file):
+            log.info("%s 파일이 없어 새로 시작합니다.", self.db_file)
+            return
+        try:
+            with open(self.db_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if "rows" in data:
+                self._load_rows(data)
+            else:
+                # 예전 형식: DB 별 id 목록 + 기능 상태
+                statuses = data.get("feature_statuses", {})
+                legacy = {
+                    DB_FEATURE: set(data.get("features", [])) | set(statuses),
+                    DB_BOARD: data.get("boards", []),
+                    DB_SCHEDULE: data.get("schedules", []),
+                }
+                for name, ids in legacy.items():
+                    if name in self.databases:
+                        self.databases[name][1].seed(ids, statuses if name == DB_FEATURE else None)
+            log.info("%s 로드 완료.", self.db_file)
+        except Exception as e:
+            log.warning("로드 중 오류: %s", e)
+
+    def _load_rows(self, data: Dict[str, Any]):
+        # version 2 파일에는 initialized 목록이 없어서, 저장된 행이 있는 DB 만 기준값이 잡힌 것으로 봅니다.
+        initialized = data.get("initialized")
+        migrating = set(data.get("migrating", []))
+        for name, rows in data.get("rows", {}).items():
+            if name in self.databases:
+                differ = self.databases[name][1]
+                differ.rows = rows
+                differ.initialized = name in initialized if initialized is not None else bool(rows)
+                differ.migrating = name in migrating
+
+    def _dump_rows(self) -> Dict[str, Any]:
+        return {
+            "rows": {name: differ.rows for name, (_, differ) in self.databases.items()},
+            "initialized": [name for name, (_, differ) in self.databases.items() if differ.initialized],
+            "migrating": [name for name, (_, differ) in self.databases.items() if differ.migrating],
+        }
+
+    def save_state(self):
+        data = {"version": 3, **self._dump_rows()}
+        try:
+            os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+            with open(self.db_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            log.warning("저장 중 오류: %s", e)
+
+    def export_state(self) -> Dict[str, Any]:
+        """행 지문과 DB 별 폴링 간격/남은 시간 (무중단 재배포 인계용)."""
+        now = time.monotonic()
+        return {
+            **self._dump_rows(),
+            "polls": {
+                name: {"interval": p.interval, "due_in": max(0.0, p.next_due - now)}
+                for name, p in self.polls.items()
+            },
+        }
+
+    def import_state(self, data: Dict[str, Any]):
+        self._load_rows(data)
+        now = time.monotonic()
+        for name, p in data.get("polls", {}).items():
+            poll = self.polls.get(name)
+            if poll:
+                poll.interval = float(p.get("interval", poll.interval))
+                poll.next_due = now + float(p.get("due_in", 0.0))
+
+    @staticmethod
+    def _headers() -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {_clean_env(NOTION_TOKEN)}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json"
+        }
+
+    async def _query_page(self, session: aiohttp.ClientSession, db_id: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        clean_db_id = _clean_env(db_id)
+        if not clean_db_id:
+            return None
+        url = f"{NOTION_API}/databases/{clean_db_id}/query"
+        started = time.perf_counter()
+        try:
+            async with session.post(url, headers=self._headers(), json=payload) as resp:
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("DB 조회 응답 %s", resp.status, extra={
+                        "event": "notion_query",
+                        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                    })
+                if resp.status != 200:
+                    log.warning("DB 조회 실패 (HTTP %s)", resp.status, extra={"event": "notion_query"})
+                    return None
+                return await resp.json()
+        except Exception as e:
+            log.warning("DB 조회 오류: %s", e, extra={"event": "notion_query"})
+            return None
+
+    async def _query(self, session: aiohttp.ClientSession, db_id: str, payload: Dict[str, Any]) -> Optional[tuple]:
+        """페이지를 따라가며 조회합니다. (행 목록, 끝까지 받았는지) 또는 실패 시 None."""
+        rows: List[Dict[str, Any]] = []
+        payload = dict(payload, page_size=PAGE_SIZE)
+        for _ in range(MAX_PAGES):
+            data = await self._query_page(session, db_id, payload)
+            if data is None:
+                return None
+            rows.extend(data.get("results", []))
+            if not data.get("has_more") or not data.get("next_cursor"):
+                return rows, True
+            payload["start_cursor"] = data["next_cursor"]
+        return rows, False
+
+    async def _fetch_notion_db(self, session: aiohttp.ClientSession, db_id: str) -> Optional[tuple]:
+        payload = {"sorts": [{"timestamp": "last_edited_time", "direction": "descending"}]}
+        return await self._query(session, db_id, payload)
+
+    # [핵심] 오늘 이후 일정의 (행 id, 디스코드 이름, 시작/종료 시각) 목록
+    # 이름 -> 멤버 매핑은 길드 정보가 필요하므로 봇 쪽에서 합니다.
+    async def fetch_active_schedules(self, session: aiohttp.ClientSession) -> Optional[Dict[str, Any]]:
+        if not NOTION_DATABASE_SCHEDULE_ID:
+            return None
+
+        today_str = now_kst().strftime("%Y-%m-%d")
+        # 필터: 날짜가 오늘 이후이거나 오늘인 것
+        payload = {
+            "filter": {
+                "property": "날짜",
+                "date": {
+                    "on_or_after": today_str
+                }
+            }
+        }
+        fetched = await self._query(session, NOTION_DATABASE_SCHEDULE_ID, payload)
+        if fetched is None:
+            return None
+
+        now = now_kst()
+        entries = []
+        boundaries = set()
+        for row in fetched[0]:
+            item = _schedule_item(row)
+            start_dt = _parse_notion_dt(item["start"])
+            end_dt = _parse_notion_dt(item["end"])
+            for b in (start_dt, end_dt):
+                if b and b > now:
+                    boundaries.add(b)
+            if not end_dt or end_dt < now:
+                continue
+            for name in item["names"]:
+                entries.append({
+                    "id": item["id"],
+                    "name": name,
+                    "start": (start_dt or end_dt).isoformat(),
+                    "end": end_dt.isoformat(),
+                })
+        self._schedule_boundaries = sorted(boundaries)
+        return make_event(EVENT_ACTIVE_SCHEDULES, entries=entries)
+
+    async def _poll_db(self, session: aiohttp.ClientSession, name: str) -> tuple:
+        db_id, differ = self.databases[name]
+        fetched = await self._fetch_notion_db(session, db_id)
+        if fetched is None:
+            return [], False
+        rows, complete = fetched
+
+        if any(not differ.knows(row["id"]) for row in rows):
+            await asyncio.sleep(SETTLE_SECONDS)
+            fetched = await self._fetch_notion_db(session, db_id) or fetched
+            rows, complete = fetched
+
+        # 기준값을 처음 잡은 결과는 변경이 없어도 저장해야, 재시작 뒤 다시 기준값 모드로 돌아가지 않습니다.
+        first = not differ.initialized or differ.migrating
+        changes = differ.diff(rows, complete)
+        if first or changes:
+            self.save_state()
+        if not changes:
+            return [], False
+        return [make_event(EVENT_ROW_CHANGES, db=name, changes=changes)], True
+
+    def _active_schedules_stale(self, mono_now: float) -> bool:
+        if self._active_fetched_at is None:
+            return True
+        if mono_now - self._active_fetched_at >= NOTION_POLL_MAX_SECONDS:
+            return True
+        wall_now = now_kst()
+        return any(
+            0 <= (b - wall_now).total_seconds() <= NOTION_SCHEDULE_LEAD_SECONDS * 2
+            for b in self._schedule_boundaries[:3]
+        )
+
+    async def _poll_schedules(self, session: aiohttp.ClientSession) -> tuple:
+        events, changed = await self._poll_db(session, DB_SCHEDULE)
+        if changed or self._active_schedules_stale(time.monotonic()):
+            active = await self.fetch_active_schedules(session)
+            if active is not None:
+                self._active_fetched_at = time.monotonic()
+                events.append(active)
+        return events, changed
+
+    def _pull_in_schedule_poll(self, mono_now: float):
+        """다음 일정 시작/종료 시각 NOTION_SCHEDULE_LEAD_SECONDS 전에는 일정 DB 를 꼭 조회합니다."""
+        poll = self.polls.get(DB_SCHEDULE)
+        if not poll:
+            return
+        wall_now = now_kst()
+        for boundary in self._schedule_boundaries:
+            delay = (boundary - wall_now).total_seconds() - NOTION_SCHEDULE_LEAD_SECONDS
+            if delay > 0:
+                poll.pull_in(mono_now + delay)
+                return
+
+    def seconds_until_next_due(self) -> float:
+        if not self.polls:
+            return float(NOTION_POLL_MAX_SECONDS)
+        now = time.monotonic()
+        return max(0.0, min(p.next_due for p in self.polls.values()) - now)
+
+    async def poll_due(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
+        """조회 시점이 된 DB 만 조회하고 감지된 변경 이벤트를 돌려줍니다."""
+        events: List[Dict[str, Any]] = []
+        if not NOTION_TOKEN:
+            return events
+
+        for name, poll in self.polls.items():
+            if not poll.is_due(time.monotonic()):
+                continue
+            if name == DB_SCHEDULE:
+                db_events, changed = await self._poll_schedules(session)
+            else:
+                db_events, changed = await self._poll_db(session, name)
+            events.extend(db_events)
+            poll.record(changed, time.monotonic())
+
+        self._pull_in_schedule_poll(time.monotonic())
+        return events
@@ -0,0 +1,54 @@
+# notion_worker.py
+# 노션 폴링을 봇과 별도 프로세스로 실행합니다. (NOTION_MODE=ipc 일 때 사용)
+# main.py 가 NOTION_WORKER_SPAWN=1 이면 자식 프로세스로 띄우고,
+# docker compose 에서는 notion-worker 서비스로 따로 띄울 수도 있습니다.
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from config import NOTION_IPC_HOST, NOTION_IPC_PORT, NOTION_IPC_TOKEN
+from notion_ipc import EventPublisher
+from notion_sync import NotionSyncEngine, EVENT_ACTIVE_SCHEDULES
+from log_setup import setup_logging
+
+RECONNECT_SECONDS = 30
+
+log = logging.getLogger("notion")
+
+
+async def main():
+    engine = NotionSyncEngine()
+    if not engine.enabled:
+        log.warning("설정 부족으로 폴링 안 함")
+        return
+
+    publisher = EventPublisher(NOTION_IPC_HOST, NOTION_IPC_PORT, NOTION_IPC_TOKEN)
+    log.info("워커 시작 (봇 주소 %s:%s)", NOTION_IPC_HOST, NOTION_IPC_PORT)
+    try:
+        async with aiohttp.ClientSession() as session:
+            while True:
+                started = time.perf_counter()
+                try:
+                    for event in await engine.poll_due(session):
+                        await publisher.publish(event, sticky=event["type"] == EVENT_ACTIVE_SCHEDULES)
+                    await publisher.flush()
+                except Exception:
+                    log.exception("폴링 오류", extra={"event": "notion_poll"})
+                else:
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug("폴링 완료", extra={
+                            "event": "notion_poll",
+                            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                        })
+                # DB 별 적응형 간격 중 가장 가까운 조회 시점까지 대기
+                # (봇 재시작 후 재연결이 너무 늦지 않도록 최대 RECONNECT_SECONDS 마다 깨어남)
+                await asyncio.sleep(min(RECONNECT_SECONDS, max(1.0, engine.seconds_until_next_due())))
+    finally:
+        await publisher.close()
+
+
+if __name__ == "__main__":
+    setup_logging("notion-worker")
+    asyncio.run(main())
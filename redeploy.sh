@@ -13,11 +13,59 @@ if [ ! -f .env ]; then
     exit 1
 fi
 
+# 커밋 정보를 파일로 구워 넣습니다 (봇은 시작할 때 git 을 호출하지 않고 이 파일을 읽음)
+git log -1 --pretty='%h%n%an%n%s' > build_info.txt
+
 echo "🐳 [2/4] 봇을 재조립(Build)하고 갈아끼웁니다..."
 # --build: 코드 변경사항 적용을 위해 강제 재빌드
 # -d: 백그라운드 실행
 # --remove-orphans: 설정에서 삭제된 컨테이너 정리
-docker compose up -d --build --remove-orphans
+OLD_BOT=$(docker compose ps -q my-bot)
+if [ -z "$OLD_BOT" ]; then
+    docker compose up -d --build --remove-orphans
+else
+    docker compose build my-bot
+    if [ ! -S data/handoff.sock ]; then
+        # 기존 봇이 인계를 지원하지 않는 버전(또는 HANDOFF_ENABLED=0)이면 리스를 쥐고 있지 않으므로,
+        # 새 봇을 옆에 띄우면 둘 다 디스코드에 접속합니다. 기존 봇을 먼저 내리고 교체합니다.
+        echo "ℹ️ 기존 봇이 상태 인계를 지원하지 않아 중지 후 교체합니다."
+        docker compose up -d --build --remove-orphans
+    else
+        # 무중단 재배포: 새 컨테이너를 기존 컨테이너 옆에 띄우면, 새 봇이 상태를 넘겨받고(handoff.py)
+        # 기존 봇은 인계가 끝나는 즉시 스스로 종료합니다.
+        # 인계 후 종료된 기존 컨테이너가 다시 살아나지 않도록 재시작 정책을 끕니다.
+        docker update --restart=no "$OLD_BOT" > /dev/null
+        docker compose up -d --no-deps --no-recreate --scale my-bot=2 my-bot
+        NEW_BOT=$(docker compose ps -q my-bot | grep -v "$OLD_BOT" | head -n 1)
+
+        # 새 봇이 리스를 쥐면 data/bot.lease 에 자기 호스트 이름(컨테이너 id 앞 12자리)을 씁니다.
+        HELD=0
+        for _ in $(seq 120); do
+            if [ "$(cut -d' ' -f2 data/bot.lease 2>/dev/null)" = "${NEW_BOT:0:12}" ]; then
+                HELD=1
+                break
+            fi
+            sleep 1
+        done
+
+        if [ "$HELD" != 1 ]; then
+            # 인계 실패: 기존 봇은 상태를 되살려 계속 실행 중이므로 새 봇을 내리고 그대로 둡니다.
+            echo "❌ [오류] 새 봇이 제한 시간 안에 리스를 넘겨받지 못했습니다. 새 봇을 내리고 기존 봇을 유지합니다."
+            docker stop "$NEW_BOT" > /dev/null
+            docker rm "$NEW_BOT" > /dev/null
+            docker update --restart=always "$OLD_BOT" > /dev/null
+            exit 1
+        fi
+
+        # 리스를 넘긴 기존 봇은 이미 종료 중입니다.
+        if ! timeout 30 docker wait "$OLD_BOT" > /dev/null; then
+            docker stop "$OLD_BOT" > /dev/null
+        fi
+        docker rm "$OLD_BOT" > /dev/null
+        # 나머지 서비스(노션 워커 등)도 새 이미지로 갱신
+        docker compose up -d --build --remove-orphans
+    fi
+fi
 
 echo "🧹 [3/4] 서버 용량 확보를 위해 쓰레기 파일(구버전 이미지)을 청소합니다..."
 docker image prune -f
@@ -0,0 +1,137 @@
+# schedule_index.py
+# 사용자별 일정 구간 인덱스
+# 노션 일정 행(row) 단위로 추가/수정/삭제하고, 사용자마다 겹치는 구간을 합친 정렬 목록을 유지해서
+# "지금 이 사람이 일정 중인가?" 를 이분 탐색(O(log n))으로 답합니다.
+import bisect
+import datetime as dt
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+Window = Tuple[dt.datetime, dt.datetime]
+
+
+class ScheduleIndex:
+    def __init__(self):
+        # row_id -> (user_ids, start, end)
+        self._rows: Dict[str, Tuple[Tuple[int, ...], dt.datetime, dt.datetime]] = {}
+        self._user_rows: Dict[int, Set[str]] = {}
+        # user_id -> 시작 시각 순으로 정렬되고 서로 겹치지 않는 구간 목록
+        self._merged: Dict[int, List[Window]] = {}
+        self._starts: Dict[int, List[dt.datetime]] = {}
+        self._listeners: List[Callable[[], None]] = []
+
+    def add_listener(self, callback: Callable[[], None]):
+        """인덱스가 바뀔 때마다 호출됩니다 (다음 일정 타이머 재설정용)."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            callback()
+
+    def _set_row(self, row_id: str, row: Optional[Tuple[Tuple[int, ...], dt.datetime, dt.datetime]]):
+        prev = self._rows.pop(row_id, None)
+        if prev:
+            for uid in prev[0]:
+                self._user_rows.get(uid, set()).discard(row_id)
+        if row:
+            self._rows[row_id] = row
+            for uid in row[0]:
+                self._user_rows.setdefault(uid, set()).add(row_id)
+
+    def _rebuild_users(self, user_ids: Iterable[int]):
+        for uid in set(user_ids):
+            row_ids = self._user_rows.get(uid) or set()
+            windows = sorted(self._rows[rid][1:] for rid in row_ids)
+            merged: List[Window] = []
+            for s, e in windows:
+                if merged and s <= merged[-1][1]:
+                    if e > merged[-1][1]:
+                        merged[-1] = (merged[-1][0], e)
+                else:
+                    merged.append((s, e))
+            if merged:
+                self._merged[uid] = merged
+                self._starts[uid] = [s for s, _ in merged]
+            else:
+                self._merged.pop(uid, None)
+                self._starts.pop(uid, None)
+                self._user_rows.pop(uid, None)
+
+    def upsert(self, row_id: str, user_ids: Iterable[int], start: dt.datetime, end: dt.datetime):
+        users = tuple(sorted(set(user_ids)))
+        if end < start:
+            start, end = end, start
+        prev = self._rows.get(row_id)
+        if prev == (users, start, end):
+            return
+        self._set_row(row_id, (users, start, end) if users else None)
+        self._rebuild_users(users + (prev[0] if prev else ()))
+        self._notify()
+
+    def remove(self, row_id: str):
+        prev = self._rows.get(row_id)
+        if prev:
+            self._set_row(row_id, None)
+            self._rebuild_users(prev[0])
+            self._notify()
+
+    def replace(self, rows: Dict[str, Tuple[Iterable[int], dt.datetime, dt.datetime]]):
+        """전체 목록으로 교체합니다 (주기적인 전체 재동기화용)."""
+        self._rows.clear()
+        self._user_rows.clear()
+        self._merged.clear()
+        self._starts.clear()
+        for rid, (users, s, e) in rows.items():
+            users = tuple(sorted(set(users)))
+            if users:
+                self._set_row(rid, (users, min(s, e), max(s, e)))
+        self._rebuild_users(list(self._user_rows))
+        self._notify()
+
+    def snapshot(self) -> Dict[str, Tuple[List[int], str, str]]:
+        """replace() 로 되살릴 수 있는 JSON 형태 (무중단 재배포 인계용)."""
+        return {rid: (list(users), s.isoformat(), e.isoformat()) for rid, (users, s, e) in self._rows.items()}
+
+    def has_user(self, user_id: int) -> bool:
+        return user_id in self._merged
+
+    def current_window(self, user_id: int, now: dt.datetime) -> Optional[Window]:
+        """now 가 사용자의 일정 구간 안이면 (시작, 끝) 을 돌려줍니다."""
+        starts = self._starts.get(user_id)
+        if not starts:
+            return None
+        i = bisect.bisect_right(starts, now) - 1
+        if i < 0:
+            return None
+        window = self._merged[user_id][i]
+        return window if now < window[1] else None
+
+    def next_start(self, after: dt.datetime) -> Optional[Tuple[dt.datetime, List[int]]]:
+        """after 이후 가장 먼저 시작하는 구간의 시작 시각과 해당 사용자 목록."""
+        best: Optional[dt.datetime] = None
+        users: List[int] = []
+        for uid, starts in self._starts.items():
+            i = bisect.bisect_right(starts, after)
+            if i >= len(starts):
+                continue
+            s = starts[i]
+            if best is None or s < best:
+                best, users = s, [uid]
+            elif s == best:
+                users.append(uid)
+        return (best, users) if best is not None else None
+
+    def prune(self, before: dt.datetime):
+        """이미 끝난 일정 행을 정리합니다."""
+        stale = [rid for rid, (_, _, e) in self._rows.items() if e < before]
+        if not stale:
+            return
+        users = set()
+        for rid in stale:
+            users.update(self._rows[rid][0])
+            self._set_row(rid, None)
+        self._rebuild_users(users)
+        self._notify()
@@ -1,14 +1,22 @@
 # state_store.py
 import os
 import json
+import logging
 import datetime as dt
 from typing import Dict, Any
 
 from time_utils import now_kst, parse_iso, iso
 
+log = logging.getLogger("voice")
+
+def default_log_file(data_file: str) -> str:
+    return os.path.splitext(data_file)[0] + "_sessions.jsonl"
+
 class StateStore:
-    def __init__(self, data_file: str):
+    def __init__(self, data_file: str, log_file: str | None = None):
         self.data_file = data_file
+        # 끝난 세션을 한 줄씩 쌓아 두는 기록 파일 (내보내기용, 덮어쓰지 않고 append 만 함)
+        self.log_file = log_file or default_log_file(data_file)
         self.state: Dict[str, Dict[str, Any]] = {
             "totals": {},   # user_id(str) -> 누적 초(int)
             "sessions": {}  # user_id(str) -> 시작시각(ISO str)
@@ -38,3 +46,13 @@ class StateStore:
         elapsed = int((end - start).total_seconds())
         if elapsed > 0:
             self.state["totals"][uid] = self.state["totals"].get(uid, 0) + elapsed
+            self.append_session_log(uid, start, end, elapsed)
+
+    def append_session_log(self, uid: str, start: dt.datetime, end: dt.datetime, seconds: int):
+        record = {"user_id": uid, "start": iso(start), "end": iso(end), "seconds": seconds}
+        try:
+            os.makedirs(os.path.dirname(self.log_file) or ".", exist_ok=True)
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            log.warning("세션 기록 저장 실패: %s", e)
@@ -11,3 +11,16 @@ def iso(dtobj: dt.datetime) -> str:
 
 def parse_iso(s: str) -> dt.datetime:
     return dt.datetime.fromisoformat(s)
+
+def get_tz(name: str | None) -> dt.tzinfo:
+    """"KST" / "UTC", "+09:00" 같은 고정 오프셋, 또는 IANA 이름(Asia/Seoul)을 tzinfo 로 바꿉니다."""
+    if not name or name.upper() == "KST":
+        return KST
+    if name.upper() == "UTC":
+        return dt.timezone.utc
+    if name[0] in "+-":
+        hours, _, minutes = name[1:].partition(":")
+        offset = dt.timedelta(hours=int(hours), minutes=int(minutes or 0))
+        return dt.timezone(-offset if name[0] == "-" else offset)
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
@@ -0,0 +1,78 @@
+# voice_export.py
+# 음성 채널 체류 기록 내보내기 (CSV / 줄 단위 JSON, gzip 압축)
+# 세션 기록 파일을 한 줄씩 읽어 바로 압축 파일에 쓰므로, 기록이 아무리 커도 메모리 사용량은 일정합니다.
+# 파일 입출력은 블로킹이므로 봇에서는 asyncio.to_thread 로 호출합니다.
+import csv
+import datetime as dt
+import gzip
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from time_utils import KST, parse_iso
+
+FORMATS = ("csv", "jsonl")
+KINDS = ("sessions", "totals")
+
+SESSION_COLUMNS = ["user_id", "start", "end", "seconds", "open"]
+TOTAL_COLUMNS = ["user_id", "seconds", "hours", "sessions"]
+
+
+def iter_sessions(
+    log_file: str,
+    start: dt.datetime,
+    end: dt.datetime,
+    open_sessions: Optional[Dict[str, str]] = None,
+    now: Optional[dt.datetime] = None,
+) -> Iterator[Dict[str, Any]]:
+    """[start, end) 안에서 시작한 세션을 하나씩 돌려줍니다. 진행 중인 세션은 open=True 로 끝에 붙입니다."""
+    if os.path.exists(log_file):
+        with open(log_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    rec_start = parse_iso(rec["start"])
+                except (ValueError, KeyError):
+                    continue
+                if start <= rec_start < end:
+                    yield {**rec, "open": False}
+
+    for uid, start_iso in (open_sessions or {}).items():
+        rec_start = parse_iso(start_iso)
+        if start <= rec_start < end and now:
+            yield {
+                "user_id": uid,
+                "start": start_iso,
+                "end": now.astimezone(KST).isoformat(),
+                "seconds": max(0, int((now - rec_start).total_seconds())),
+                "open": True,
+            }
+
+
+def iter_totals(sessions: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """사용자별 합계. 사용자 수만큼만 메모리를 씁니다."""
+    totals: Dict[str, list] = {}
+    for rec in sessions:
+        acc = totals.setdefault(rec["user_id"], [0, 0])
+        acc[0] += rec["seconds"]
+        acc[1] += 1
+    for uid, (seconds, count) in sorted(totals.items(), key=lambda kv: kv[1][0], reverse=True):
+        yield {"user_id": uid, "seconds": seconds, "hours": round(seconds / 3600.0, 2), "sessions": count}
+
+
+def write_export(out_path: str, records: Iterable[Dict[str, Any]], fmt: str, columns: list) -> int:
+    """records 를 gzip 압축된 CSV / JSONL 로 씁니다. 쓴 행 수를 돌려줍니다."""
+    count = 0
+    with gzip.open(out_path, "wb") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for rec in records:
+                writer.writerow(rec)
+                count += 1
+        else:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                count += 1
+    return count
@@ -0,0 +1,102 @@
+# voice_normalizer.py
+# 음성 채널 입장/퇴장 이벤트 안정화 (flap suppression)
+# 모바일 재접속이나 잠깐의 채널 이동으로 생기는 퇴장 -> 재입장을 하나의 연속된 세션으로 합칩니다.
+# 전환(입장/퇴장)이 grace_seconds 동안 유지돼야 비로소 on_enter / on_leave 를 호출하며,
+# 이때 시각은 실제로 전환이 일어난 시각(at)을 넘겨 세션 시간이 어긋나지 않게 합니다.
+import asyncio
+import datetime as dt
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+log = logging.getLogger("voice")
+
+VoiceCallback = Callable[[Any, Any, dt.datetime], Awaitable[None]]
+
+ENTER = "enter"
+LEAVE = "leave"
+
+
+class VoiceEventNormalizer:
+    def __init__(self, grace_seconds: float, on_enter: VoiceCallback, on_leave: VoiceCallback):
+        self.grace_seconds = grace_seconds
+        self.on_enter = on_enter
+        self.on_leave = on_leave
+        # member_id -> (종류, member, channel, 전환 시각, 확정 대기 task)
+        self._pending: Dict[int, Tuple[str, Any, Any, dt.datetime, asyncio.Task]] = {}
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def is_pending(self, member_id: int) -> bool:
+        return member_id in self._pending
+
+    async def feed_enter(self, member, channel, at: dt.datetime):
+        await self._feed(ENTER, member, channel, at)
+
+    async def feed_leave(self, member, channel, at: dt.datetime):
+        await self._feed(LEAVE, member, channel, at)
+
+    async def _feed(self, kind: str, member, channel, at: dt.datetime):
+        if self.grace_seconds <= 0:
+            await self._callback(kind)(member, channel, at)
+            return
+
+        pending = self._pending.get(member.id)
+        if pending:
+            if pending[0] == kind:
+                return  # 같은 전환이 이미 대기 중
+            # 반대 전환이 grace 안에 들어옴 -> 둘 다 없던 일로 (세션 유지 / 짧은 방문 무시)
+            pending[4].cancel()
+            del self._pending[member.id]
+            return
+
+        task = asyncio.create_task(self._commit_later(kind, member, channel, at))
+        self._pending[member.id] = (kind, member, channel, at, task)
+
+    def _callback(self, kind: str) -> VoiceCallback:
+        return self.on_enter if kind == ENTER else self.on_leave
+
+    async def _commit_later(self, kind: str, member, channel, at: dt.datetime, delay: float | None = None):
+        await asyncio.sleep(self.grace_seconds if delay is None else delay)
+        pending = self._pending.get(member.id)
+        if not pending or pending[4] is not asyncio.current_task():
+            return
+        del self._pending[member.id]
+        await self._commit(kind, member, channel, at)
+
+    async def _commit(self, kind: str, member, channel, at: dt.datetime):
+        try:
+            await self._callback(kind)(member, channel, at)
+        except Exception:
+            log.exception("%s 처리 오류 (%s)", kind, member.id, extra={"event": f"voice_{kind}"})
+
+    async def flush(self):
+        """대기 중인 전환을 즉시 확정합니다 (종료/재시작 직전).
+        하나가 실패해도 나머지는 계속 확정합니다."""
+        while self._pending:
+            member_id = next(iter(self._pending))
+            kind, member, channel, at, task = self._pending.pop(member_id)
+            task.cancel()
+            await self._commit(kind, member, channel, at)
+
+    def take_pending(self) -> List[Tuple[str, Any, Any, dt.datetime]]:
+        """대기 중인 전환을 확정하지 않고 꺼냅니다 (cog 재로드/인계 때 새 인스턴스로 넘기기 위해)."""
+        pending = [(kind, member, channel, at) for kind, member, channel, at, _ in self._pending.values()]
+        self.cancel_all()
+        return pending
+
+    def restore(self, kind: str, member, channel, at: dt.datetime):
+        """take_pending 으로 꺼낸 전환을 다시 대기시킵니다. 남은 grace 시간만큼만 기다립니다."""
+        prev = self._pending.pop(member.id, None)
+        if prev:
+            prev[4].cancel()
+        elapsed = (dt.datetime.now(at.tzinfo) - at).total_seconds()
+        delay = max(0.0, self.grace_seconds - elapsed)
+        task = asyncio.create_task(self._commit_later(kind, member, channel, at, delay))
+        self._pending[member.id] = (kind, member, channel, at, task)
+
+    def cancel_all(self):
+        for *_, task in self._pending.values():
+            task.cancel()
+        self._pending.clear()